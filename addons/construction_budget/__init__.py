@@ -1 +1,6 @@
-from . import models
\ No newline at end of file
+from . import models
+
+
+def post_init_hook(env):
+    """Guess the kind of the stages that existed before installation"""
+    env['project.task.type'].with_context(active_test=False).search([])._init_stage_kinds()
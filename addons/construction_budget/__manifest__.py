@@ -1,6 +1,6 @@
 {
     'name': 'Construction Budget Management',
-    'version': '17.0.1.0.0',
+    'version': '17.0.1.1.0',
     'category': 'Project',
     'summary': 'Budget tracking for construction projects without Enterprise accounting',
     'description': """
@@ -42,6 +42,7 @@ the Enterprise Accounting module.
     ],
     'data': [
         'security/ir.model.access.csv',
+        'security/activity_event_security.xml',
         'data/budget_categories.xml',
         'views/project_budget_views.xml',
         'views/project_views.xml',
@@ -59,4 +60,5 @@ the Enterprise Accounting module.
     'application': True,
     'auto_install': False,
     'license': 'LGPL-3',
+    'post_init_hook': 'post_init_hook',
 }
\ No newline at end of file
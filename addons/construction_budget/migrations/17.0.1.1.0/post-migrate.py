@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import api, fields, SUPERUSER_ID
+from odoo.tools.sql import table_exists
+
+# Recent history replayed into the new activity stream
+_EVENT_BACKFILL_DAYS = 30
+
+# Stock movement types reported in the activity stream, see construction.stock.move
+_STOCK_MOVE_TITLES = {
+    'receipt': ('receipt', 'Material received'),
+    'receipt_reversal': ('receipt', 'Material rejected'),
+    'consumption': ('consumption', 'Material consumed'),
+    'consumption_cancel': ('consumption', 'Consumption cancelled'),
+}
+
+
+def migrate(cr, version):
+    """Guess the kind of existing stages, which stage_kind used to compute from their name,
+    and seed the activity stream from recent project history"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['project.task.type'].with_context(active_test=False).search([])._init_stage_kinds()
+    _seed_activity_events(env)
+
+
+def _seed_activity_events(env):
+    """Replay the last days of tasks, expenses, deliveries and stock moves as events.
+
+    The dashboard feed and team last activity only read events now, so
+    without this they would stay empty until new activity is logged.
+    Deliveries and stock moves belong to modules that are not loaded yet
+    while this module migrates, they are read from their tables if present.
+    Events are created oldest first since id order is the feed order.
+    """
+    Event = env['construction.activity.event']
+    if Event.search_count([], limit=1):
+        return
+    since = fields.Datetime.now() - timedelta(days=_EVENT_BACKFILL_DAYS)
+    events = []
+
+    tasks = env['project.task'].with_context(active_test=False).search([
+        ('project_id', '!=', False), ('write_date', '>=', since),
+    ])
+    for task in tasks:
+        events.append(dict(
+            task._get_activity_event_vals(f"Task updated: {task.name}"),
+            date=task.write_date,
+            user_id=task.write_uid.id,
+        ))
+
+    expenses = env['hr.expense'].search([
+        ('construction_project_id', '!=', False), ('create_date', '>=', since),
+    ])
+    for expense in expenses:
+        events.append({
+            'project_id': expense.construction_project_id.id,
+            'date': expense.create_date,
+            'user_id': expense.create_uid.id,
+            'event_type': 'expense',
+            'name': f"Expense: {expense.name}",
+            'description': f"Amount: ${expense.total_amount:.2f}",
+            'res_model': expense._name,
+            'res_id': expense.id,
+        })
+
+    if table_exists(env.cr, 'construction_material_delivery'):
+        env.cr.execute("""
+            SELECT id, project_id, material_name, quantity, unit, state, write_date, write_uid
+              FROM construction_material_delivery
+             WHERE project_id IS NOT NULL AND write_date >= %s
+        """, [since])
+        for row in env.cr.dictfetchall():
+            events.append({
+                'project_id': row['project_id'],
+                'date': row['write_date'],
+                'user_id': row['write_uid'],
+                'event_type': 'delivery',
+                'name': f"Delivery: {row['material_name']}",
+                'description': f"{row['quantity']} {row['unit']} - {(row['state'] or '').capitalize()}",
+                'res_model': 'construction.material.delivery',
+                'res_id': row['id'],
+            })
+
+    if table_exists(env.cr, 'construction_stock_move'):
+        env.cr.execute("""
+            SELECT move.project_id, move.date, move.user_id, move.move_type, move.quantity,
+                   move.receipt_id, move.consumption_id, material.name AS material_name,
+                   material.unit_of_measure
+              FROM construction_stock_move move
+              JOIN construction_material material ON material.id = move.material_id
+             WHERE move.project_id IS NOT NULL AND move.date >= %s AND move.move_type IN %s
+        """, [since, tuple(_STOCK_MOVE_TITLES)])
+        for row in env.cr.dictfetchall():
+            event_type, title = _STOCK_MOVE_TITLES[row['move_type']]
+            if row['receipt_id']:
+                res_model, res_id = 'construction.material.receipt', row['receipt_id']
+            elif row['consumption_id']:
+                res_model, res_id = 'construction.material.consumption', row['consumption_id']
+            else:
+                res_model, res_id = False, 0
+            events.append({
+                'project_id': row['project_id'],
+                'date': row['date'],
+                'user_id': row['user_id'],
+                'event_type': event_type,
+                'name': f"{title}: {row['material_name']}",
+                'description': f"{abs(row['quantity'])} {row['unit_of_measure'] or ''}".strip(),
+                'res_model': res_model,
+                'res_id': res_id,
+            })
+
+    events.sort(key=lambda vals: vals['date'])
+    Event._log(events)
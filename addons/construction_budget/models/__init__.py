@@ -2,4 +2,7 @@ from . import project_budget
 from . import budget_category
 from . import project_project
 from . import hr_expense
-from . import purchase_order
\ No newline at end of file
+from . import purchase_order
+from . import project_task_type
+from . import project_task
+from . import activity_event
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, tools
+from odoo.exceptions import UserError
+
+ACTIVITY_EVENT_TYPES = [
+    ('task', 'Task'),
+    ('expense', 'Expense'),
+    ('consumption', 'Material Consumption'),
+    ('receipt', 'Material Receipt'),
+    ('delivery', 'Material Delivery'),
+]
+
+
+class ActivityEvent(models.Model):
+    _name = 'construction.activity.event'
+    _description = 'Activity Event - Append-Only Project Activity Stream'
+    # Events are only ever appended, so id order is chronological order
+    _order = 'id desc'
+
+    project_id = fields.Many2one(
+        'project.project',
+        string='Project',
+        required=True,
+        ondelete='cascade',
+        help='Project the activity happened in'
+    )
+    date = fields.Datetime(
+        string='Date',
+        required=True,
+        default=fields.Datetime.now,
+        help='Moment the activity happened'
+    )
+    user_id = fields.Many2one(
+        'res.users',
+        string='User',
+        default=lambda self: self.env.user,
+        ondelete='set null',
+        help='User who performed the activity'
+    )
+    event_type = fields.Selection(
+        ACTIVITY_EVENT_TYPES,
+        string='Type',
+        required=True
+    )
+    name = fields.Char(
+        string='Title',
+        required=True
+    )
+    description = fields.Char(
+        string='Description'
+    )
+    res_model = fields.Char(
+        string='Document Model',
+        help='Model of the document the activity is about'
+    )
+    res_id = fields.Integer(
+        string='Document ID',
+        help='ID of the document the activity is about'
+    )
+
+    def init(self):
+        # Feeds page backwards through one project's events
+        tools.create_index(
+            self._cr, 'construction_activity_event_project_id_index',
+            self._table, ['project_id', 'id'],
+        )
+        # Last activity of each member of a project
+        tools.create_index(
+            self._cr, 'construction_activity_event_project_user_date_index',
+            self._table, ['project_id', 'user_id', 'date'],
+        )
+
+    def write(self, vals):
+        raise UserError("Activity events are an append-only stream and cannot be modified.")
+
+    def unlink(self):
+        raise UserError("Activity events are an append-only stream and cannot be deleted.")
+
+    @api.model
+    def _log(self, vals_list):
+        """Append events; entries without a project are skipped"""
+        vals_list = [vals for vals in vals_list if vals.get('project_id')]
+        if not vals_list:
+            return self.browse()
+        return self.sudo().create(vals_list)
+
+    @api.model
+    def _check_project_access(self, project_ids):
+        """Raise AccessError unless the user can read all the given projects"""
+        projects = self.env['project.project'].browse(project_ids)
+        projects.check_access_rights('read')
+        projects.check_access_rule('read')
+
+    @api.model
+    def get_feed(self, project_ids, before_id=None, limit=20, event_types=None):
+        """Latest events of the given projects, newest first.
+
+        Pages are keyset based: pass the returned ``cursor`` as
+        ``before_id`` to get the next, older page. Returns a dict with
+        ``events`` (search_read rows), ``cursor`` and ``has_more``.
+        """
+        self._check_project_access(project_ids)
+        domain = [('project_id', 'in', project_ids)]
+        if before_id:
+            domain.append(('id', '<', before_id))
+        if event_types:
+            domain.append(('event_type', 'in', event_types))
+        events = self.search_read(domain, [
+            'project_id', 'date', 'user_id', 'event_type', 'name', 'description',
+            'res_model', 'res_id',
+        ], limit=limit + 1)
+
+        has_more = len(events) > limit
+        events = events[:limit]
+        return {
+            'events': events,
+            'cursor': events[-1]['id'] if events else before_id,
+            'has_more': has_more,
+        }
+
+    @api.model
+    def get_last_seen(self, project_id, user_ids=None):
+        """Date of the latest event of each user in a project, ``{user_id: date}``"""
+        self._check_project_access([project_id])
+        domain = [('project_id', '=', project_id), ('user_id', '!=', False)]
+        if user_ids is not None:
+            domain.append(('user_id', 'in', list(user_ids)))
+        return {
+            user.id: last_date
+            for user, last_date in self._read_group(domain, ['user_id'], ['date:max'])
+        }
@@ -65,6 +65,22 @@ class HrExpense(models.Model):
         else:
             return {'domain': {'project_budget_line_id': []}}
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        expenses = super().create(vals_list)
+        expenses._log_activity_events("Expense")
+        return expenses
+
+    def _log_activity_events(self, label):
+        self.env['construction.activity.event']._log([{
+            'project_id': expense.construction_project_id.id,
+            'event_type': 'expense',
+            'name': f"{label}: {expense.name}",
+            'description': f"Amount: ${expense.total_amount:.2f}",
+            'res_model': expense._name,
+            'res_id': expense.id,
+        } for expense in self])
+
     def _update_budget_on_approval(self):
         """Update budget line when expense is approved"""
         for expense in self:
@@ -75,6 +91,7 @@ class HrExpense(models.Model):
     def action_submit_expenses(self):
         """Override to update budget when submitting"""
         result = super().action_submit_expenses()
+        self._log_activity_events("Expense submitted")
         return result
 
     def approve_expense_sheets(self):
@@ -115,6 +132,13 @@ class HrExpenseSheet(models.Model):
         for sheet in self:
             sheet.total_budget_impact = sum(sheet.expense_line_ids.mapped('total_amount'))
 
+    def _do_approve(self):
+        """Log approved expenses to the project activity stream"""
+        result = super()._do_approve()
+        self.filtered(lambda sheet: sheet.state == 'approve').expense_line_ids._log_activity_events(
+            "Expense approved")
+        return result
+
     def action_sheet_move_create(self):
         """Override to update budgets when creating accounting entries"""
         result = super().action_sheet_move_create()
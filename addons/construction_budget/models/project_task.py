@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+
+# Task fields whose change is reported in the project activity stream
+_ACTIVITY_TASK_FIELDS = {'name', 'stage_id', 'user_ids', 'date_deadline', 'priority'}
+
+
+class ProjectTask(models.Model):
+    _inherit = 'project.task'
+
+    stage_kind = fields.Selection(
+        related='stage_id.stage_kind',
+        string='Stage Kind',
+        store=True,
+        index=True,
+        help='Kind of the current stage, stored for grouping and filtering'
+    )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        tasks = super().create(vals_list)
+        self.env['construction.activity.event']._log([
+            task._get_activity_event_vals(f"Task created: {task.name}")
+            for task in tasks
+        ])
+        return tasks
+
+    def write(self, vals):
+        res = super().write(vals)
+        if _ACTIVITY_TASK_FIELDS.intersection(vals):
+            if 'stage_id' in vals:
+                events = [task._get_activity_event_vals(f"Task moved: {task.name}") for task in self]
+            elif 'user_ids' in vals:
+                events = [task._get_activity_event_vals(
+                    f"Task assigned: {task.name}",
+                    f"Assigned to: {', '.join(task.user_ids.mapped('name')) or 'Nobody'}",
+                ) for task in self]
+            else:
+                events = [task._get_activity_event_vals(f"Task updated: {task.name}") for task in self]
+            self.env['construction.activity.event']._log(events)
+        return res
+
+    def _get_activity_event_vals(self, title, description=None):
+        self.ensure_one()
+        return {
+            'project_id': self.project_id.id,
+            'event_type': 'task',
+            'name': title,
+            'description': description or f"Stage: {self.stage_id.name or 'No Stage'}",
+            'res_model': self._name,
+            'res_id': self.id,
+        }
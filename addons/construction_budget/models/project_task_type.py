@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from collections import defaultdict
+
+
+STAGE_KIND_SELECTION = [
+    ('todo', 'To Do'),
+    ('progress', 'In Progress'),
+    ('review', 'Review'),
+    ('blocked', 'Blocked'),
+    ('done', 'Done'),
+]
+
+# Default task progress (%) reached in each kind of stage
+STAGE_KIND_WEIGHTS = {
+    'todo': 0.0,
+    'progress': 50.0,
+    'review': 75.0,
+    'blocked': 0.0,
+    'done': 100.0,
+}
+
+# Name keywords used to guess the kind of a stage, checked in this order
+_STAGE_KIND_KEYWORDS = [
+    ('done', ('done', 'complete', 'closed', 'finish', 'готов', 'выполн', 'заверш', 'закрыт')),
+    ('blocked', ('blocked', 'waiting', 'hold', 'заблок', 'ожида', 'приостанов')),
+    ('review', ('review', 'test', 'провер', 'приемк', 'приёмк')),
+    ('progress', ('progress', 'doing', 'working', 'started', 'в работе', 'выполняется', 'процесс')),
+]
+
+
+class ProjectTaskType(models.Model):
+    _inherit = 'project.task.type'
+
+    # Kind and weight are only guessed from the name when a stage is
+    # created; after that they are set by hand, so renaming or translating
+    # a stage never changes what it means for task progress
+    stage_kind = fields.Selection(
+        STAGE_KIND_SELECTION,
+        string='Stage Kind',
+        required=True,
+        default='todo',
+        index=True,
+        help='What this stage means for task progress, independent of its name'
+    )
+    progress_weight = fields.Float(
+        string='Progress Weight (%)',
+        help='Task progress reached once a task is in this stage'
+    )
+
+    @api.model
+    def _guess_stage_kind(self, name):
+        """Best guess of a stage kind from its name"""
+        name = (name or '').lower()
+        for kind, keywords in _STAGE_KIND_KEYWORDS:
+            if any(keyword in name for keyword in keywords):
+                return kind
+        return 'todo'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if 'stage_kind' not in vals:
+                vals['stage_kind'] = self._guess_stage_kind(vals.get('name'))
+            if 'progress_weight' not in vals:
+                vals['progress_weight'] = STAGE_KIND_WEIGHTS.get(vals['stage_kind'], 0.0)
+        return super().create(vals_list)
+
+    @api.onchange('name')
+    def _onchange_name_stage_kind(self):
+        # Only new stages follow their name, saved ones keep their kind
+        if not self._origin:
+            self.stage_kind = self._guess_stage_kind(self.name)
+
+    @api.onchange('stage_kind')
+    def _onchange_stage_kind(self):
+        self.progress_weight = STAGE_KIND_WEIGHTS.get(self.stage_kind, 0.0)
+
+    def _init_stage_kinds(self):
+        """Guess kind and weight of existing stages from any of their translations"""
+        if not self:
+            return
+        self.flush_model(['name'])
+        self.env.cr.execute("SELECT id, name FROM project_task_type WHERE id IN %s", [tuple(self.ids)])
+        stage_ids_by_kind = defaultdict(list)
+        for stage_id, names in self.env.cr.fetchall():
+            guesses = (self._guess_stage_kind(name) for name in (names or {}).values())
+            stage_ids_by_kind[next((kind for kind in guesses if kind != 'todo'), 'todo')].append(stage_id)
+        for kind, stage_ids in stage_ids_by_kind.items():
+            self.browse(stage_ids).write({'stage_kind': kind, 'progress_weight': STAGE_KIND_WEIGHTS[kind]})
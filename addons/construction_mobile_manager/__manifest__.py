@@ -60,12 +60,14 @@ Benefits:
     'depends': [
         'base',
         'web',
+        'bus',
         'project',
         'hr_expense',
         'construction_budget',
     ],
     'data': [
         'security/ir.model.access.csv',
+        'data/task_sync_data.xml',
         'views/mobile_dashboard_views.xml',
         'views/mobile_expense_views.xml',
         'views/mobile_task_views.xml',
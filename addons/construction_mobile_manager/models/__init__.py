@@ -2,4 +2,6 @@
 
 from . import mobile_dashboard
 from . import mobile_expense
-from . import mobile_task
\ No newline at end of file
+from . import mobile_task
+from . import task_sync
+from . import ir_websocket
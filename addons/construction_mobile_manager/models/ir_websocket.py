@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+from .task_sync import PROJECT_CHANNEL_PREFIX
+
+
+class IrWebsocket(models.AbstractModel):
+    _inherit = 'ir.websocket'
+
+    def _build_bus_channel_list(self, channels):
+        # Project board channels are only granted for projects the user can read
+        channels = list(channels)
+        requested = {
+            channel: channel[len(PROJECT_CHANNEL_PREFIX):]
+            for channel in channels
+            if isinstance(channel, str) and channel.startswith(PROJECT_CHANNEL_PREFIX)
+        }
+        if requested:
+            project_ids = [int(suffix) for suffix in requested.values() if suffix.isdigit()]
+            allowed = set(self.env['project.project'].search([('id', 'in', project_ids)]).ids)
+            channels = [
+                channel for channel in channels
+                if not (isinstance(channel, str) and channel in requested)
+                or (requested[channel].isdigit() and int(requested[channel]) in allowed)
+            ]
+        return super()._build_bus_channel_list(channels)
@@ -22,16 +22,13 @@ class MobileDashboard(models.Model):
         """Get dashboard data for the current user"""
         user = self.env.user
 
-        # Get user's assigned tasks
-        assigned_tasks = self.env['project.task'].search([
-            ('user_ids', 'in', [user.id])
-        ])
-
-        # Calculate task statistics
-        total_tasks = len(assigned_tasks)
-        todo_tasks = assigned_tasks.filtered(lambda t: t.stage_id.name.lower() in ['to do', 'new', 'draft'])
-        in_progress_tasks = assigned_tasks.filtered(lambda t: 'progress' in t.stage_id.name.lower() or 'doing' in t.stage_id.name.lower())
-        done_tasks = assigned_tasks.filtered(lambda t: t.stage_id.name.lower() in ['done', 'complete', 'closed'])
+        # Count user's assigned tasks per stage kind in one grouped query
+        task_domain = [('user_ids', 'in', [user.id])]
+        kind_counts = dict(self.env['project.task']._read_group(
+            task_domain, ['stage_kind'], ['__count'],
+        ))
+        total_tasks = sum(kind_counts.values())
+        recent_tasks = self.env['project.task'].search(task_domain, limit=5)
 
         # Get recent expenses
         recent_expenses = self.env['hr.expense'].search([
@@ -48,16 +45,16 @@ class MobileDashboard(models.Model):
         return {
             'user_name': user.name,
             'total_tasks': total_tasks,
-            'todo_tasks': len(todo_tasks),
-            'in_progress_tasks': len(in_progress_tasks),
-            'done_tasks': len(done_tasks),
+            'todo_tasks': kind_counts.get('todo', 0),
+            'in_progress_tasks': kind_counts.get('progress', 0),
+            'done_tasks': kind_counts.get('done', 0),
             'recent_tasks': [{
                 'id': task.id,
                 'name': task.name,
                 'stage': task.stage_id.name,
                 'project': task.project_id.name,
                 'priority': task.priority,
-            } for task in assigned_tasks[:5]],
+            } for task in recent_tasks],
             'recent_expenses': [{
                 'id': expense.id,
                 'name': expense.name,
@@ -15,21 +15,36 @@ class MobileTaskManager(models.Model):
     @api.model
     def get_my_tasks(self, stage_filter=None):
         """Get current user's assigned tasks with mobile-optimized data"""
-        user = self.env.user
-
-        domain = [('user_ids', 'in', [user.id])]
-
-        # Add stage filter if provided
-        if stage_filter:
-            if stage_filter == 'todo':
-                domain.append(('stage_id.name', 'ilike', 'to do'))
-            elif stage_filter == 'progress':
-                domain.extend(['|', ('stage_id.name', 'ilike', 'progress'), ('stage_id.name', 'ilike', 'doing')])
-            elif stage_filter == 'done':
-                domain.extend(['|', '|', ('stage_id.name', 'ilike', 'done'), ('stage_id.name', 'ilike', 'complete'), ('stage_id.name', 'ilike', 'closed')])
-
+        domain = self._get_my_tasks_scope() + self._get_stage_filter_domain(stage_filter)
         tasks = self.env['project.task'].search(domain, order='priority desc, date_deadline asc, name')
+        return self._get_tasks_data(tasks)
 
+    @api.model
+    def get_my_task_changes(self, since=None, stage_filter=None):
+        """Delta of :meth:`get_my_tasks` since the cursor of the previous call.
+
+        Returns ``tasks`` to add or update, ``removed`` task ids, the next
+        ``cursor``, ``has_more`` when another call is needed right away and
+        ``reset`` when the local list must be dropped and rebuilt.
+        """
+        user = self.env.user
+        changes = self.env['project.task']._get_task_changes(
+            self._get_my_tasks_scope(),
+            [('user_ids', 'in', [user.id])],
+            since=since,
+            filter_domain=self._get_stage_filter_domain(stage_filter),
+        )
+        return dict(changes, tasks=self._get_tasks_data(changes['tasks']))
+
+    def _get_my_tasks_scope(self):
+        return [('user_ids', 'in', [self.env.user.id])]
+
+    def _get_stage_filter_domain(self, stage_filter):
+        # Stage filter is a stage kind: todo, progress, review, blocked or done
+        return [('stage_kind', '=', stage_filter)] if stage_filter else []
+
+    def _get_tasks_data(self, tasks):
+        """Mobile-optimized data of the given tasks"""
         task_data = []
         for task in tasks:
             # Get budget info if available
@@ -43,7 +58,7 @@ class MobileTaskManager(models.Model):
                 budget_remaining = task.budget_line_id.remaining_amount
 
             # Determine status color
-            status_color = self._get_status_color(task.stage_id.name if task.stage_id else '')
+            status_color = self._get_status_color(task.stage_kind)
 
             task_data.append({
                 'id': task.id,
@@ -65,17 +80,16 @@ class MobileTaskManager(models.Model):
 
         return task_data
 
-    def _get_status_color(self, stage_name):
-        """Get color code for task status"""
-        stage_lower = stage_name.lower()
-        if any(word in stage_lower for word in ['done', 'complete', 'closed', 'finished']):
+    def _get_status_color(self, stage_kind):
+        """Get color code for a stage kind"""
+        if stage_kind == 'done':
             return 'success'  # Green
-        elif any(word in stage_lower for word in ['progress', 'doing', 'working', 'started']):
+        elif stage_kind in ('progress', 'review'):
             return 'warning'  # Orange
-        elif any(word in stage_lower for word in ['blocked', 'waiting', 'hold']):
+        elif stage_kind == 'blocked':
             return 'danger'   # Red
         else:
-            return 'secondary'  # Gray (To Do, New, etc.)
+            return 'secondary'  # Gray (To Do, no stage)
 
     @api.model
     def update_task_status(self, task_id, new_status):
@@ -89,8 +103,10 @@ class MobileTaskManager(models.Model):
             return {'success': False, 'message': 'You are not assigned to this task'}
 
         try:
-            # Find or create stage
+            # Find stage by name, then by kind (works for localized stage names)
             stage = task.project_id.type_ids.filtered(lambda s: s.name.lower() == new_status.lower())
+            if not stage:
+                stage = task.project_id.type_ids.filtered(lambda s: s.stage_kind == new_status.lower())
 
             if not stage:
                 # Create common stages if they don't exist
@@ -102,19 +118,23 @@ class MobileTaskManager(models.Model):
                 elif new_status.lower() == 'done':
                     stage_name = 'Done'
 
-                stage = self.env['project.task.type'].create({
+                stage_vals = {
                     'name': stage_name,
                     'project_ids': [(6, 0, [task.project_id.id])],
-                })
+                }
+                if new_status.lower() in ('todo', 'progress', 'done'):
+                    stage_vals['stage_kind'] = new_status.lower()
+                stage = self.env['project.task.type'].create(stage_vals)
 
             # Update task stage
-            task.stage_id = stage[0] if isinstance(stage, list) else stage
+            stage = stage[0]
+            task.stage_id = stage
 
             return {
                 'success': True,
                 'message': f'Task status updated to {stage.name}',
                 'new_stage': stage.name,
-                'color': self._get_status_color(stage.name)
+                'color': self._get_status_color(stage.stage_kind)
             }
 
         except Exception as e:
@@ -167,7 +187,7 @@ class MobileTaskManager(models.Model):
         available_stages = [{
             'name': stage.name,
             'key': stage.name.lower().replace(' ', ''),
-            'color': self._get_status_color(stage.name),
+            'color': self._get_status_color(stage.stage_kind),
         } for stage in task.project_id.type_ids]
 
         return {
@@ -176,7 +196,7 @@ class MobileTaskManager(models.Model):
             'description': task.description or 'No description provided',
             'project_name': task.project_id.name,
             'current_stage': task.stage_id.name if task.stage_id else 'No Stage',
-            'current_stage_color': self._get_status_color(task.stage_id.name if task.stage_id else ''),
+            'current_stage_color': self._get_status_color(task.stage_kind),
             'priority': task.priority,
             'deadline': task.date_deadline.strftime('%Y-%m-%d') if task.date_deadline else None,
             'assignees': [{'id': user.id, 'name': user.name} for user in task.user_ids],
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from odoo import models, fields, api, tools
+from odoo.osv import expression
+
+
+# Tombstones older than this are purged; older cursors need a full resync
+_SYNC_RETENTION_DAYS = 30
+
+# Bus channel of a project board is this prefix followed by the project id
+PROJECT_CHANNEL_PREFIX = 'construction_project_'
+
+# Task fields whose changes are pushed to open boards
+_BOARD_NOTIFY_FIELDS = {'project_id', 'stage_id', 'priority', 'user_ids', 'sequence'}
+
+# Changes this recent are sent again on the next sync, so a transaction
+# committing after a newer one was already served is not skipped
+_SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class TaskTombstone(models.Model):
+    _name = 'construction.task.tombstone'
+    _description = 'Task Tombstone - Tasks Deleted or Moved Away, for Delta Sync'
+    _order = 'date, id'
+
+    task_id = fields.Integer(
+        string='Task ID',
+        required=True,
+        index=True,
+        help='Id of the task that disappeared'
+    )
+    project_id = fields.Many2one(
+        'project.project',
+        string='Left Project',
+        ondelete='cascade',
+        help='Project the task no longer belongs to'
+    )
+    user_ids = fields.Many2many(
+        'res.users',
+        string='Left Users',
+        help='Users the task is no longer assigned to'
+    )
+    date = fields.Datetime(
+        string='Date',
+        required=True,
+        default=fields.Datetime.now,
+        help='Moment the task disappeared'
+    )
+
+    def init(self):
+        tools.create_index(
+            self._cr, 'construction_task_tombstone_project_date_index',
+            self._table, ['project_id', 'date'],
+        )
+
+    @api.model
+    def _cron_purge_tombstones(self):
+        cutoff = fields.Datetime.now() - timedelta(days=_SYNC_RETENTION_DAYS)
+        self.search([('date', '<', cutoff)]).unlink()
+
+
+class ProjectTask(models.Model):
+    _inherit = 'project.task'
+
+    def write(self, vals):
+        before = {}
+        if _BOARD_NOTIFY_FIELDS.intersection(vals):
+            before = {task.id: (task.project_id.id, set(task.user_ids.ids)) for task in self}
+        res = super().write(vals)
+        if before:
+            tombstones = []
+            for task in self:
+                old_project_id, old_user_ids = before[task.id]
+                left_project_id = old_project_id if old_project_id != task.project_id.id else False
+                left_user_ids = old_user_ids - set(task.user_ids.ids)
+                if left_project_id or left_user_ids:
+                    tombstones.append({
+                        'task_id': task.id,
+                        'project_id': left_project_id,
+                        'user_ids': [(6, 0, list(left_user_ids))],
+                    })
+            if tombstones:
+                self.env['construction.task.tombstone'].sudo().create(tombstones)
+            self._notify_board_changes(before)
+        return res
+
+    def unlink(self):
+        tombstones = [{
+            'task_id': task.id,
+            'project_id': task.project_id.id,
+            'user_ids': [(6, 0, task.user_ids.ids)],
+        } for task in self]
+        res = super().unlink()
+        self.env['construction.task.tombstone'].sudo().create(tombstones)
+        self._send_board_notifications([
+            ({vals['project_id']}, vals['user_ids'][0][2], {'id': vals['task_id'], 'removed': True})
+            for vals in tombstones
+        ])
+        return res
+
+    def _get_board_patch(self):
+        """Card fields clients patch in place when a board notification arrives"""
+        self.ensure_one()
+        return {
+            'id': self.id,
+            'project_id': self.project_id.id,
+            'stage_id': self.stage_id.id,
+            'stage_name': self.stage_id.name or '',
+            'stage_kind': self.stage_kind,
+            'priority': self.priority,
+            'sequence': self.sequence,
+            'assignees': [{'id': user.id, 'name': user.name} for user in self.user_ids],
+            'write_date': fields.Datetime.to_string(self.write_date),
+        }
+
+    def _notify_board_changes(self, before):
+        """Push patches of changed tasks to their old and new project and assignees"""
+        self._send_board_notifications([
+            ({before[task.id][0], task.project_id.id}, before[task.id][1] | set(task.user_ids.ids), task.id)
+            for task in self
+        ])
+
+    def _send_board_notifications(self, changes):
+        """Queue ``(project_ids, user_ids, task_id or removal patch)`` items for commit.
+
+        Project boards listen on their project channel; mobile task lists
+        get the patches of their own tasks on the user's partner channel.
+        Changes are buffered for the whole transaction and sent at commit,
+        one bus message per channel with one patch per task in its final
+        state, however many writes touched it.
+        """
+        data = self.env.cr.precommit.data
+        buffered = data.get('construction_task_board_changes')
+        if buffered is None:
+            buffered = data['construction_task_board_changes'] = defaultdict(dict)
+            self.env.cr.precommit.add(self._flush_board_notifications)
+        for project_ids, user_ids, change in changes:
+            task_id = change['id'] if isinstance(change, dict) else change
+            channels = [f'{PROJECT_CHANNEL_PREFIX}{project_id}' for project_id in project_ids if project_id]
+            for channel in channels + list(user_ids):
+                buffered[channel][task_id] = change if isinstance(change, dict) else None
+
+    def _flush_board_notifications(self):
+        """Send the buffered board changes, one bus message per channel"""
+        buffered = self.env.cr.precommit.data.pop('construction_task_board_changes', None)
+        if not buffered:
+            return
+        task_ids = {task_id for changes in buffered.values()
+                    for task_id, removal in changes.items() if removal is None}
+        patches = {task.id: task._get_board_patch()
+                   for task in self.sudo().browse(task_ids).exists()}
+        by_channel = {}
+        for channel, changes in buffered.items():
+            tasks = [
+                removal or patches.get(task_id) or {'id': task_id, 'removed': True}
+                for task_id, removal in changes.items()
+            ]
+            if tasks:
+                by_channel[channel] = tasks
+
+        partners = {
+            user.id: user.partner_id
+            for user in self.env['res.users'].sudo().browse(
+                [key for key in by_channel if isinstance(key, int)])
+        }
+        self.env['bus.bus']._sendmany([
+            (partners[key] if isinstance(key, int) else key, 'construction_task_update', {'tasks': tasks})
+            for key, tasks in by_channel.items()
+        ])
+
+    @api.model
+    def _parse_sync_cursor(self, cursor):
+        """``(write_date, id)`` of a cursor, or ``(None, 0)`` for none"""
+        if not cursor:
+            return None, 0
+        date, task_id = cursor.split('|')
+        return datetime.fromisoformat(date), int(task_id)
+
+    @api.model
+    def _get_task_changes(self, scope_domain, tombstone_domain, since=None, filter_domain=None, limit=500):
+        """Tasks of ``scope_domain`` changed after the ``since`` cursor.
+
+        ``since`` is the opaque cursor returned by the previous call; without
+        it every task of the scope is returned. Changed tasks that no longer
+        match ``filter_domain`` (or were archived) are reported in
+        ``removed`` together with the tombstones matching
+        ``tombstone_domain``. ``reset`` means the cursor predates tombstone
+        retention and the client must drop its local state.
+
+        Returns a dict with ``tasks`` (records), ``removed`` (ids),
+        ``cursor``, ``has_more`` and ``reset``.
+        """
+        now = fields.Datetime.now()
+        since_date, since_id = self._parse_sync_cursor(since)
+        reset = bool(since_date and since_date < now - timedelta(days=_SYNC_RETENTION_DAYS))
+        if reset:
+            since_date, since_id = None, 0
+
+        domain = list(scope_domain)
+        if since_date:
+            domain = expression.AND([domain, [
+                '|', ('write_date', '>', since_date),
+                '&', ('write_date', '=', since_date), ('id', '>', since_id),
+            ]])
+        changed = self.with_context(active_test=False).search(domain, order='write_date, id', limit=limit)
+        has_more = len(changed) == limit
+
+        tasks = changed.filtered('active')
+        if filter_domain:
+            tasks = tasks.filtered_domain(filter_domain)
+        removed = set((changed - tasks).ids)
+        if since_date:
+            tombstones = self.env['construction.task.tombstone'].sudo().search(
+                expression.AND([tombstone_domain, [('date', '>', since_date)]]))
+            removed.update(tombstones.mapped('task_id'))
+        removed -= set(tasks.ids)
+
+        # Advance the cursor, but keep the overlap window to be sent again
+        horizon = (now - _SYNC_OVERLAP, 0)
+        since_key = (since_date, since_id) if since_date else horizon
+        if has_more:
+            cursor_key = (changed[-1].write_date, changed[-1].id)
+        elif changed:
+            cursor_key = max(since_key, min((changed[-1].write_date, changed[-1].id), horizon))
+        else:
+            cursor_key = max(since_key, horizon)
+
+        return {
+            'tasks': tasks,
+            'removed': sorted(removed),
+            'cursor': f'{cursor_key[0].isoformat()}|{cursor_key[1]}',
+            'has_more': has_more,
+            'reset': reset,
+        }
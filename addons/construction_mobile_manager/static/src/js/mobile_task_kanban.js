@@ -4,8 +4,36 @@ import { KanbanView } from "@web/views/kanban/kanban_view";
 import { KanbanController } from "@web/views/kanban/kanban_controller";
 import { KanbanRenderer } from "@web/views/kanban/kanban_renderer";
 import { registry } from "@web/core/registry";
+import { onWillUnmount, useSubEnv } from "@odoo/owl";
 
 export class MobileTaskKanbanController extends KanbanController {
+    setup() {
+        super.setup();
+        this.rpc = this.env.services.rpc;
+        this.notification = this.env.services.notification;
+        this.taskState = { tasks: {}, cursor: null, filter: null };
+
+        // The renderer reaches the task list through the env, an OWL renderer
+        // has no handle on its controller
+        this.mobileTasks = {
+            loadTasks: (filter) => this.loadTasks(filter),
+            updateTaskStatus: (taskId, newStatus) => this.updateTaskStatus(taskId, newStatus),
+            listeners: new Set(),
+        };
+        useSubEnv({ mobileTasks: this.mobileTasks });
+
+        // Changes to the user's tasks arrive on their own partner channel
+        this.busService = this.env.services.bus_service;
+        this.onTaskUpdate = async () => {
+            const tasks = await this.syncTasks();
+            for (const listener of this.mobileTasks.listeners) {
+                listener(tasks);
+            }
+        };
+        this.busService.subscribe("construction_task_update", this.onTaskUpdate);
+        onWillUnmount(() => this.busService.unsubscribe("construction_task_update", this.onTaskUpdate));
+    }
+
     /**
      * Handle mobile task status updates
      */
@@ -44,19 +72,39 @@ export class MobileTaskKanbanController extends KanbanController {
      * Load tasks with filtering
      */
     async loadTasks(filter = null) {
-        try {
-            const tasks = await this.rpc("/web/dataset/call_kw/construction.mobile.task.manager/get_my_tasks", {
-                model: "construction.mobile.task.manager",
-                method: "get_my_tasks",
-                args: [filter],
-                kwargs: {},
-            });
+        this.taskState = { tasks: {}, cursor: null, filter: filter };
+        return this.syncTasks();
+    }
 
-            return tasks;
+    /**
+     * Apply task changes since the last sync to the local task list
+     */
+    async syncTasks() {
+        const state = this.taskState;
+        try {
+            let changes;
+            do {
+                changes = await this.rpc("/web/dataset/call_kw/construction.mobile.task.manager/get_my_task_changes", {
+                    model: "construction.mobile.task.manager",
+                    method: "get_my_task_changes",
+                    args: [state.cursor, state.filter],
+                    kwargs: {},
+                });
+                if (changes.reset) {
+                    state.tasks = {};
+                }
+                for (const taskId of changes.removed) {
+                    delete state.tasks[taskId];
+                }
+                for (const task of changes.tasks) {
+                    state.tasks[task.id] = task;
+                }
+                state.cursor = changes.cursor;
+            } while (changes.has_more);
         } catch (error) {
             console.error("Failed to load tasks:", error);
-            return [];
         }
+        return Object.values(state.tasks);
     }
 }
 
@@ -67,6 +115,11 @@ export class MobileTaskKanbanRenderer extends KanbanRenderer {
     setup() {
         super.setup();
         this.setupMobileHandlers();
+        // Re-render the list whenever pushed changes were synced
+        this.mobileTasks = this.env.mobileTasks;
+        this.onTasksChanged = (tasks) => this.renderTaskList(tasks);
+        this.mobileTasks.listeners.add(this.onTasksChanged);
+        onWillUnmount(() => this.mobileTasks.listeners.delete(this.onTasksChanged));
     }
 
     setupMobileHandlers() {
@@ -100,13 +153,13 @@ export class MobileTaskKanbanRenderer extends KanbanRenderer {
         $(`.o_mobile_filter_btn[data-filter="${filter}"]`).removeClass('btn-secondary').addClass('btn-primary active');
 
         // Load filtered tasks
-        this.controller.loadTasks(filter === 'all' ? null : filter).then(tasks => {
+        this.mobileTasks.loadTasks(filter === 'all' ? null : filter).then(tasks => {
             this.renderTaskList(tasks);
         });
     }
 
     handleStatusChange(taskId, newStatus) {
-        this.controller.updateTaskStatus(taskId, newStatus);
+        this.mobileTasks.updateTaskStatus(taskId, newStatus);
     }
 
     handleQuickStatusUpdate(taskId, currentStage) {
@@ -122,7 +175,7 @@ export class MobileTaskKanbanRenderer extends KanbanRenderer {
             nextStatus = 'todo'; // Reset to beginning
         }
 
-        this.controller.updateTaskStatus(taskId, nextStatus);
+        this.mobileTasks.updateTaskStatus(taskId, nextStatus);
     }
 
     renderTaskList(tasks) {
@@ -64,12 +64,17 @@ Perfect for construction project managers who need comprehensive project oversig
         'security/ir.model.access.csv',
         'views/pm_dashboard_views.xml',
         'views/pm_dashboard_kanban.xml',
+        'views/budget_alert_views.xml',
         'data/dashboard_data.xml',
+        'data/budget_alert_data.xml',
     ],
     'assets': {
         'web.assets_backend': [
             'construction_pm_dashboard/static/src/css/pm_dashboard.css',
             'construction_pm_dashboard/static/src/css/pm_dashboard_enhanced.css',
+            'construction_pm_dashboard/static/src/js/pm_dashboard.js',
+            'construction_pm_dashboard/static/src/js/pm_kanban.js',
+            'construction_pm_dashboard/static/src/xml/pm_dashboard_templates.xml',
         ],
         'web.assets_frontend': [
             'construction_pm_dashboard/static/src/css/pm_dashboard.css',
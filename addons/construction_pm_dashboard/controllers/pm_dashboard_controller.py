@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import http
+from odoo import http, fields
 from odoo.http import request
 import json
 
@@ -10,32 +10,79 @@ class PMDashboardController(http.Controller):
     @http.route('/pm_dashboard', type='http', auth='user')
     def pm_dashboard_page(self, project_id=None, **kwargs):
         """Render PM Dashboard web page"""
-        # Get dashboard data
+        # Get dashboard data, unless the browser's copy is still current
         dashboard = request.env['construction.pm.dashboard']
-        data = dashboard.get_dashboard_data(int(project_id) if project_id else None)
+        client_etag = next(iter(request.httprequest.if_none_match), None)
+        etag, data = dashboard.get_cached_dashboard_data(int(project_id) if project_id else None, client_etag)
+        if data is None:
+            return request.make_response('', headers=self._etag_headers(etag), status=304)
 
-        return request.render('construction_pm_dashboard.pm_dashboard_template', {
+        response = request.render('construction_pm_dashboard.pm_dashboard_template', {
             'dashboard_data': data,
             'page_title': 'Project Manager Dashboard'
         })
+        if etag:
+            response.headers.extend(self._etag_headers(etag))
+        return response
 
     @http.route('/pm_dashboard/data', type='json', auth='user')
-    def get_dashboard_data(self, project_id=None):
+    def get_dashboard_data(self, project_id=None, etag=None):
         """Get dashboard data via AJAX"""
         dashboard = request.env['construction.pm.dashboard']
-        return dashboard.get_dashboard_data(project_id)
+        return self._conditional_payload(*dashboard.get_cached_dashboard_data(project_id, etag))
 
     @http.route('/pm_dashboard/refresh', type='json', auth='user')
-    def refresh_dashboard(self, project_id=None):
+    def refresh_dashboard(self, project_id=None, etag=None):
         """Refresh dashboard data"""
         dashboard = request.env['construction.pm.dashboard']
-        return dashboard.refresh_dashboard(project_id)
+        return self._conditional_payload(*dashboard.get_cached_dashboard_data(project_id, etag))
+
+    @http.route('/pm_dashboard/sections', type='json', auth='user')
+    def get_dashboard_sections(self, sections, project_id=None, etag=None):
+        """Get only the listed dashboard sections, e.g. ['projects', 'current_project']"""
+        dashboard = request.env['construction.pm.dashboard']
+        return self._conditional_payload(*dashboard.get_cached_dashboard_data(project_id, etag, sections))
+
+    @http.route('/pm_dashboard/section/<string:section>', type='json', auth='user')
+    def get_dashboard_section(self, section, project_id=None, etag=None):
+        """Get a single dashboard section"""
+        dashboard = request.env['construction.pm.dashboard']
+        if section not in dashboard._DASHBOARD_SECTIONS:
+            return {'error': f'Unknown dashboard section: {section}'}
+        return self._conditional_payload(*dashboard.get_cached_dashboard_data(project_id, etag, [section]))
+
+    @http.route('/pm_dashboard/activity', type='json', auth='user')
+    def get_activity_feed(self, project_id, before_id=None, limit=None):
+        """Next page of the activity feed, older than ``before_id``"""
+        return request.env['construction.pm.dashboard'].get_activity_feed(project_id, before_id, limit)
+
+    def _etag_headers(self, etag):
+        """Headers making the browser revalidate its copy on every visit"""
+        return [('ETag', f'"{etag}"'), ('Cache-Control', 'private, no-cache')]
+
+    def _conditional_payload(self, etag, data):
+        """JSON counterpart of 304 Not Modified for polling clients"""
+        if data is None:
+            return {'not_modified': True, 'etag': etag}
+        return dict(data, etag=etag)
 
     @http.route('/pm_dashboard/task_board', type='json', auth='user')
-    def get_task_board(self, project_id, filters=None):
-        """Get task board data"""
+    def get_task_board(self, project_id, filters=None, limit=None):
+        """Get task board data, first page of each column"""
         task_board = request.env['construction.pm.task.board']
-        return task_board.get_board_data(project_id, filters)
+        return task_board.get_board_data(project_id, filters, limit)
+
+    @http.route('/pm_dashboard/task_board/stage_tasks', type='json', auth='user')
+    def get_stage_tasks(self, project_id, stage_id, offset=0, limit=None, filters=None):
+        """Load more cards of one task board column"""
+        task_board = request.env['construction.pm.task.board']
+        return task_board.get_stage_tasks(project_id, stage_id, offset, limit, filters)
+
+    @http.route('/pm_dashboard/task_board/changes', type='json', auth='user')
+    def get_task_board_changes(self, project_id, since=None, filters=None):
+        """Get task board changes since the last sync cursor"""
+        task_board = request.env['construction.pm.task.board']
+        return task_board.get_board_changes(project_id, since, filters)
 
     @http.route('/pm_dashboard/move_task', type='json', auth='user')
     def move_task(self, task_id, new_stage_id):
@@ -55,6 +102,12 @@ class PMDashboardController(http.Controller):
         task_board = request.env['construction.pm.task.board']
         return task_board.assign_task_user(task_id, user_id)
 
+    @http.route('/pm_dashboard/batch_update_tasks', type='json', auth='user')
+    def batch_update_tasks(self, operations):
+        """Apply several move/priority/assign/resequence operations at once"""
+        task_board = request.env['construction.pm.task.board']
+        return task_board.apply_board_operations(operations)
+
     @http.route('/pm_dashboard/create_quick_task', type='json', auth='user')
     def create_quick_task(self, project_id, name, stage_id=None, user_id=None):
         """Create quick task"""
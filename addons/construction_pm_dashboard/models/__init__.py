@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 
-from . import pm_dashboard
\ No newline at end of file
+from . import pm_dashboard
+from . import budget_alert
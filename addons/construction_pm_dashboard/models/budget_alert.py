@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from markupsafe import Markup
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+_logger = logging.getLogger(__name__)
+
+# Pending expense thresholds
+_PENDING_AMOUNT_THRESHOLD = 5000
+_PENDING_AGE_DAYS = 7
+
+# An alert is notified again at most once per interval
+_NOTIFY_INTERVAL = timedelta(hours=24)
+
+_SEVERITY_RANK = {'info': 0, 'warning': 1, 'danger': 2}
+
+# Budget line fields that can move a project across an alert threshold
+_ALERT_LINE_FIELDS = {'budget_id', 'category_id', 'quantity', 'unit_price', 'spent_amount'}
+
+
+class BudgetAlert(models.Model):
+    _name = 'construction.budget.alert'
+    _description = 'Budget Alert - Precomputed Project Budget Warnings'
+    _order = 'project_id, sequence, percentage desc, id'
+
+    project_id = fields.Many2one(
+        'project.project',
+        string='Project',
+        required=True,
+        index=True,
+        ondelete='cascade',
+        help='Project the alert was raised for'
+    )
+    category_id = fields.Many2one(
+        'construction.budget.category',
+        string='Budget Category',
+        ondelete='cascade',
+        help='Budget category the alert is about, if any'
+    )
+    key = fields.Char(
+        string='Key',
+        required=True,
+        help='Identifies the alert within its project, one record per condition'
+    )
+    alert_type = fields.Selection([
+        ('category_over', 'Category Over Budget'),
+        ('category_near', 'Category Nearly Exhausted'),
+        ('pending_high', 'High Pending Expenses'),
+        ('pending_old', 'Old Pending Expenses'),
+    ], string='Type', required=True)
+    severity = fields.Selection([
+        ('info', 'Info'),
+        ('warning', 'Warning'),
+        ('danger', 'Danger'),
+    ], string='Severity', required=True)
+    sequence = fields.Integer(string='Sequence', default=10)
+    title = fields.Char(string='Title', required=True)
+    message = fields.Char(string='Message')
+    percentage = fields.Float(string='Percentage')
+    amount = fields.Float(string='Amount')
+    count = fields.Integer(string='Count')
+    active = fields.Boolean(
+        string='Active',
+        default=True,
+        help='Cleared alerts are archived and reactivated if the condition returns'
+    )
+    first_seen = fields.Datetime(
+        string='First Seen',
+        default=fields.Datetime.now,
+        help='Moment the condition was last raised'
+    )
+    last_notified = fields.Datetime(
+        string='Last Notified',
+        help='Used to throttle notifications about the same alert'
+    )
+
+    _sql_constraints = [
+        ('project_key_uniq', 'unique(project_id, key)',
+         'An alert condition can only be recorded once per project.'),
+    ]
+
+    @api.model
+    def _evaluate_alerts(self, project_ids=None):
+        """Recompute the alerts of the given (default: all) projects.
+
+        Thresholds are evaluated from grouped queries over budget lines and
+        pending expenses for all projects at once, then diffed against the
+        stored alerts: new conditions are created or reactivated, changed
+        ones updated and cleared ones archived.
+        """
+        if project_ids is not None and not project_ids:
+            return
+        now = fields.Datetime.now()
+        expected = self._compute_expected_alerts(project_ids, now)
+
+        scope = [] if project_ids is None else [('project_id', 'in', list(project_ids))]
+        existing = {
+            (alert.project_id.id, alert.key): alert
+            for alert in self.with_context(active_test=False).search(scope)
+        }
+
+        to_create = []
+        raised = self.browse()
+        for ident, vals in expected.items():
+            alert = existing.pop(ident, None)
+            if not alert:
+                to_create.append(vals)
+                continue
+            if not alert.active:
+                vals.update(active=True, first_seen=now)
+                raised |= alert
+            elif _SEVERITY_RANK[vals['severity']] > _SEVERITY_RANK[alert.severity]:
+                raised |= alert
+            changes = {
+                name: value for name, value in vals.items()
+                if (alert[name].id if name == 'category_id' else alert[name]) != value
+            }
+            if changes:
+                alert.write(changes)
+        raised |= self.create(to_create)
+
+        cleared = [alert.id for alert in existing.values() if alert.active]
+        if cleared:
+            self.browse(cleared).write({'active': False})
+        raised._notify_raised(now)
+
+    @api.model
+    def _compute_expected_alerts(self, project_ids, now):
+        """Alert values per (project id, key) for every condition currently met"""
+        scope = [] if project_ids is None else [('project_id', 'in', list(project_ids))]
+        expense_scope = [] if project_ids is None else [('construction_project_id', 'in', list(project_ids))]
+        expected = {}
+
+        groups = self.env['construction.project.budget.line']._read_group(
+            scope + [('project_id', '!=', False)],
+            ['project_id', 'category_id'],
+            ['budget_amount:sum', 'spent_amount:sum'],
+        )
+        thresholds = {
+            row['id']: row['budget_alert_threshold']
+            for row in self.env['project.project'].with_context(active_test=False).search_read(
+                [('id', 'in', list({project.id for project, _category, _budget, _spent in groups}))],
+                ['budget_alert_threshold'],
+            )
+        }
+        for project, category, allocated, spent in groups:
+            allocated, spent = allocated or 0.0, spent or 0.0
+            if allocated <= 0:
+                continue
+            percentage = spent / allocated * 100
+            cat_name = category.name if category else 'Uncategorized'
+            vals = {
+                'project_id': project.id,
+                'category_id': category.id,
+                'key': f'category_{category.id or 0}',
+                'percentage': percentage,
+                'amount': spent,
+                'sequence': 10,
+            }
+            if spent > allocated:
+                vals.update(
+                    alert_type='category_over',
+                    severity='danger',
+                    title=f'{cat_name} Over Budget',
+                    message=f'Spent ${spent:.2f} of ${allocated:.2f} ({percentage:.1f}%)',
+                )
+            elif percentage > (thresholds.get(project.id) or 90.0):
+                vals.update(
+                    alert_type='category_near',
+                    severity='warning',
+                    title=f'{cat_name} Nearly Exhausted',
+                    message=f'Used {percentage:.1f}% of budget',
+                )
+            else:
+                continue
+            expected[(project.id, vals['key'])] = vals
+
+        Expense = self.env['hr.expense']
+        pending_domain = expense_scope + [
+            ('construction_project_id', '!=', False),
+            ('state', '=', 'reported'),
+        ]
+        for project, amount, count in Expense._read_group(
+            pending_domain, ['construction_project_id'], ['total_amount:sum', '__count'],
+        ):
+            if (amount or 0.0) > _PENDING_AMOUNT_THRESHOLD:
+                expected[(project.id, 'pending_high')] = {
+                    'project_id': project.id,
+                    'key': 'pending_high',
+                    'alert_type': 'pending_high',
+                    'severity': 'info',
+                    'title': 'High Pending Expenses',
+                    'message': f'${amount:.2f} in expenses awaiting approval',
+                    'amount': amount,
+                    'count': count,
+                    'sequence': 20,
+                }
+
+        for project, count in Expense._read_group(
+            pending_domain + [('create_date', '<', now - timedelta(days=_PENDING_AGE_DAYS))],
+            ['construction_project_id'], ['__count'],
+        ):
+            expected[(project.id, 'pending_old')] = {
+                'project_id': project.id,
+                'key': 'pending_old',
+                'alert_type': 'pending_old',
+                'severity': 'warning',
+                'title': 'Old Pending Expenses',
+                'message': f'{count} expenses pending for over a week',
+                'count': count,
+                'sequence': 30,
+            }
+
+        return expected
+
+    def _notify_raised(self, now):
+        """Post one note per project manager for newly raised or escalated alerts"""
+        alerts = self.filtered(
+            lambda a: a.project_id.user_id
+            and (not a.last_notified or a.last_notified <= now - _NOTIFY_INTERVAL)
+        )
+        if not alerts:
+            return
+        by_project = defaultdict(list)
+        for alert in alerts:
+            by_project[alert.project_id].append(alert)
+        for project, project_alerts in by_project.items():
+            lines = ['Budget alerts:'] + [f'{alert.title}: {alert.message}' for alert in project_alerts]
+            project.message_post(
+                body=Markup('<br/>').join(lines),
+                partner_ids=project.user_id.partner_id.ids,
+                subtype_xmlid='mail.mt_note',
+            )
+        alerts.write({'last_notified': now})
+
+    @api.model
+    def _cron_evaluate_alerts(self):
+        self._evaluate_alerts()
+
+    @api.model
+    def get_project_alerts(self, project_id):
+        """Active alerts of a project, most severe conditions first"""
+        return self.search([('project_id', '=', project_id)])
+
+
+class ProjectBudgetLine(models.Model):
+    _inherit = 'construction.project.budget.line'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines._update_budget_alerts(set(lines.project_id.ids))
+        return lines
+
+    def write(self, vals):
+        if not _ALERT_LINE_FIELDS.intersection(vals):
+            return super().write(vals)
+        project_ids = set(self.project_id.ids)
+        res = super().write(vals)
+        self._update_budget_alerts(project_ids | set(self.project_id.ids))
+        return res
+
+    def unlink(self):
+        project_ids = set(self.project_id.ids)
+        res = super().unlink()
+        self._update_budget_alerts(project_ids)
+        return res
+
+    def _update_budget_alerts(self, project_ids):
+        if project_ids:
+            self.env['construction.budget.alert'].sudo()._evaluate_alerts(project_ids)
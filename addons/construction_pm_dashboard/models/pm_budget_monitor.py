@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api
+from odoo.tools import date_utils
+from odoo.tools.misc import get_lang
 import logging
 from datetime import datetime, timedelta
+from dateutil.relativedelta import relativedelta
 
 _logger = logging.getLogger(__name__)
 
@@ -15,6 +18,17 @@ class PMBudgetMonitor(models.Model):
     project_id = fields.Many2one('project.project', string='Project', required=True)
     user_id = fields.Many2one('res.users', string='Project Manager', default=lambda self: self.env.user)
 
+    # Spending trend buckets: step between buckets and how many are shown
+    _TREND_PERIODS = {
+        'day': relativedelta(days=1),
+        'week': relativedelta(weeks=1),
+        'month': relativedelta(months=1),
+    }
+    _TREND_BUCKETS = {'day': 30, 'week': 12, 'month': 12}
+
+    # Expense states counted as spent
+    _SPENT_STATES = ['done', 'approved']
+
     @api.model
     def get_budget_analytics(self, project_id, period='week'):
         """Get comprehensive budget analytics"""
@@ -51,8 +65,7 @@ class PMBudgetMonitor(models.Model):
         variance_percentage = (variance / total_allocated * 100) if total_allocated > 0 else 0
 
         # Get monthly spending
-        current_month_spending = self._get_current_month_spending(project)
-        last_month_spending = self._get_last_month_spending(project)
+        current_month_spending, last_month_spending = self._get_monthly_spending(project)
         spending_trend = self._calculate_spending_trend(current_month_spending, last_month_spending)
 
         return {
@@ -125,59 +138,69 @@ class PMBudgetMonitor(models.Model):
         return category_list
 
     def _get_spending_trends(self, project, period='week'):
-        """Get spending trends over time"""
-        if period == 'week':
-            date_from = fields.Datetime.now() - timedelta(weeks=12)  # 12 weeks
-            date_grouping = 'week'
-        elif period == 'month':
-            date_from = fields.Datetime.now() - timedelta(days=365)  # 12 months
-            date_grouping = 'month'
-        else:
-            date_from = fields.Datetime.now() - timedelta(days=30)  # 30 days
-            date_grouping = 'day'
-
-        # Get expenses grouped by time period
-        expenses = self.env['hr.expense'].search([
+        """Get spending trends over time, with a cumulative (S-curve) total"""
+        granularity = period if period in self._TREND_PERIODS else 'day'
+        date_to = fields.Date.today()
+        date_from = self._get_bucket_start(
+            date_to - self._TREND_PERIODS[granularity] * (self._TREND_BUCKETS[granularity] - 1), granularity)
+
+        series = self._get_spending_series(project, granularity, date_from, date_to, with_opening=True)
+        return [dict(bucket, **self._get_period_labels(bucket['date'], granularity)) for bucket in series]
+
+    def _get_spending_series(self, project, granularity, date_from, date_to, with_opening=False):
+        """Spent amount per ``granularity`` bucket between two dates, in one query.
+
+        Every bucket in the range is returned, in date order, including those
+        without expenses. ``cumulative`` runs from the first bucket, or from
+        the project start when ``with_opening`` adds everything spent before
+        ``date_from``.
+        """
+        Expense = self.env['hr.expense']
+        domain = [
             ('construction_project_id', '=', project.id),
-            ('date', '>=', date_from.date()),
-            ('state', 'in', ['done', 'approved'])
-        ])
-
-        # Group expenses by period
-        trends = {}
-        for expense in expenses:
-            if not expense.date:
-                continue
-
-            if date_grouping == 'week':
-                # Get week start (Monday)
-                week_start = expense.date - timedelta(days=expense.date.weekday())
-                period_key = week_start.strftime('%Y-W%U')
-                period_label = week_start.strftime('%b %d')
-            elif date_grouping == 'month':
-                period_key = expense.date.strftime('%Y-%m')
-                period_label = expense.date.strftime('%b %Y')
-            else:
-                period_key = expense.date.strftime('%Y-%m-%d')
-                period_label = expense.date.strftime('%b %d')
-
-            if period_key not in trends:
-                trends[period_key] = {
-                    'period': period_key,
-                    'label': period_label,
-                    'amount': 0,
-                    'count': 0,
-                    'date': expense.date
-                }
-
-            trends[period_key]['amount'] += expense.total_amount
-            trends[period_key]['count'] += 1
-
-        # Convert to sorted list
-        trend_list = list(trends.values())
-        trend_list.sort(key=lambda x: x['date'])
-
-        return trend_list
+            ('state', 'in', self._SPENT_STATES),
+        ]
+        groups = Expense._read_group(
+            domain + [('date', '>=', date_from), ('date', '<=', date_to)],
+            [f'date:{granularity}'],
+            ['total_amount:sum', '__count'],
+        )
+        sums = {bucket_date: (amount or 0.0, count) for bucket_date, amount, count in groups}
+
+        cumulative = 0.0
+        if with_opening:
+            [(opening,)] = Expense._read_group(domain + [('date', '<', date_from)], [], ['total_amount:sum'])
+            cumulative = opening or 0.0
+
+        series = []
+        bucket_date = self._get_bucket_start(date_from, granularity)
+        while bucket_date <= date_to:
+            amount, count = sums.get(bucket_date, (0.0, 0))
+            cumulative += amount
+            series.append({
+                'date': bucket_date,
+                'amount': amount,
+                'count': count,
+                'cumulative': cumulative,
+            })
+            bucket_date += self._TREND_PERIODS[granularity]
+        return series
+
+    def _get_bucket_start(self, value, granularity):
+        """Start of the bucket containing ``value``, aligned with read_group"""
+        if granularity == 'week':
+            # read_group starts weeks on the first day of the user's language
+            first_week_day = int(get_lang(self.env).week_start) - 1
+            return value - timedelta(days=(value.weekday() - first_week_day) % 7)
+        return date_utils.start_of(value, granularity)
+
+    def _get_period_labels(self, bucket_date, granularity):
+        """Key and display label of a spending bucket"""
+        if granularity == 'week':
+            return {'period': bucket_date.strftime('%Y-W%U'), 'label': bucket_date.strftime('%b %d')}
+        elif granularity == 'month':
+            return {'period': bucket_date.strftime('%Y-%m'), 'label': bucket_date.strftime('%b %Y')}
+        return {'period': bucket_date.strftime('%Y-%m-%d'), 'label': bucket_date.strftime('%b %d')}
 
     def _get_recent_expenses(self, project):
         """Get recent expenses with detailed information"""
@@ -210,66 +233,31 @@ class PMBudgetMonitor(models.Model):
 
         return expense_data
 
+    # Icon and follow-up action per precomputed alert type
+    _ALERT_ACTIONS = {
+        'category_over': ('fa-exclamation-circle', 'review_category'),
+        'category_near': ('fa-exclamation-triangle', 'review_category'),
+        'pending_high': ('fa-clock', 'review_expenses'),
+        'pending_old': ('fa-history', 'review_old_expenses'),
+    }
+
     def _get_budget_alerts(self, project):
-        """Get budget alerts and warnings"""
+        """Get budget alerts and warnings precomputed by the alert evaluation"""
         alerts = []
-
-        # Check category overruns
-        category_breakdown = self._get_category_breakdown(project)
-        for category in category_breakdown:
-            if category['over_budget']:
-                alerts.append({
-                    'type': 'danger',
-                    'icon': 'fa-exclamation-circle',
-                    'title': f'{category["name"]} Over Budget',
-                    'message': f'Spent ${category["spent"]:.2f} of ${category["allocated"]:.2f} ({category["percentage"]:.1f}%)',
-                    'action': 'review_category',
-                    'category_id': category['id'],
-                })
-            elif category['percentage'] > 90:
-                alerts.append({
-                    'type': 'warning',
-                    'icon': 'fa-exclamation-triangle',
-                    'title': f'{category["name"]} Nearly Exhausted',
-                    'message': f'Used {category["percentage"]:.1f}% of budget',
-                    'action': 'review_category',
-                    'category_id': category['id'],
-                })
-
-        # Check for high pending expenses
-        pending_expenses = self.env['hr.expense'].search([
-            ('construction_project_id', '=', project.id),
-            ('state', '=', 'reported')
-        ])
-        pending_amount = sum(pending_expenses.mapped('total_amount'))
-
-        if pending_amount > 5000:  # Configurable threshold
-            alerts.append({
-                'type': 'info',
-                'icon': 'fa-clock',
-                'title': 'High Pending Expenses',
-                'message': f'${pending_amount:.2f} in expenses awaiting approval',
-                'action': 'review_expenses',
-                'count': len(pending_expenses),
-            })
-
-        # Check for old expenses
-        old_expenses = self.env['hr.expense'].search([
-            ('construction_project_id', '=', project.id),
-            ('state', '=', 'reported'),
-            ('create_date', '<', fields.Datetime.now() - timedelta(days=7))
-        ])
-
-        if old_expenses:
-            alerts.append({
-                'type': 'warning',
-                'icon': 'fa-history',
-                'title': 'Old Pending Expenses',
-                'message': f'{len(old_expenses)} expenses pending for over a week',
-                'action': 'review_old_expenses',
-                'count': len(old_expenses),
-            })
-
+        for alert in self.env['construction.budget.alert'].get_project_alerts(project.id):
+            icon, action = self._ALERT_ACTIONS[alert.alert_type]
+            alert_data = {
+                'type': alert.severity,
+                'icon': icon,
+                'title': alert.title,
+                'message': alert.message,
+                'action': action,
+            }
+            if alert.category_id:
+                alert_data['category_id'] = alert.category_id.id
+            else:
+                alert_data['count'] = alert.count
+            alerts.append(alert_data)
         return alerts
 
     def _get_approval_queue(self, project):
@@ -321,29 +309,20 @@ class PMBudgetMonitor(models.Model):
         return export_data
 
     # Helper methods
+    def _get_monthly_spending(self, project):
+        """Spending of the current and the previous month, from one grouped query"""
+        today = fields.Date.today()
+        start_of_last_month = date_utils.start_of(today, 'month') - relativedelta(months=1)
+        last_month, current_month = self._get_spending_series(project, 'month', start_of_last_month, today)
+        return current_month['amount'], last_month['amount']
+
     def _get_current_month_spending(self, project):
         """Get current month spending"""
-        start_of_month = fields.Date.today().replace(day=1)
-        expenses = self.env['hr.expense'].search([
-            ('construction_project_id', '=', project.id),
-            ('date', '>=', start_of_month),
-            ('state', 'in', ['done', 'approved'])
-        ])
-        return sum(expenses.mapped('total_amount'))
+        return self._get_monthly_spending(project)[0]
 
     def _get_last_month_spending(self, project):
         """Get last month spending"""
-        today = fields.Date.today()
-        start_of_last_month = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
-        end_of_last_month = today.replace(day=1) - timedelta(days=1)
-
-        expenses = self.env['hr.expense'].search([
-            ('construction_project_id', '=', project.id),
-            ('date', '>=', start_of_last_month),
-            ('date', '<=', end_of_last_month),
-            ('state', 'in', ['done', 'approved'])
-        ])
-        return sum(expenses.mapped('total_amount'))
+        return self._get_monthly_spending(project)[1]
 
     def _calculate_spending_trend(self, current, last):
         """Calculate spending trend"""
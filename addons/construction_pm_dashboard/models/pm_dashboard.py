@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api
+from odoo.tools.lru import LRU
+import hashlib
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
 
 _logger = logging.getLogger(__name__)
@@ -41,9 +44,52 @@ class PMDashboard(models.Model):
         for record in self:
             record.name = f"PM Dashboard - {record.user_id.name}"
 
+    # Built payloads keyed by database and ETag; the ETag covers user, project,
+    # sections and data version, so outdated entries are never hit and age out
+    _dashboard_cache = LRU(256)
+
+    _DASHBOARD_SECTIONS = (
+        'projects', 'current_project', 'task_board', 'budget_monitor', 'team_overview', 'recent_activity',
+    )
+
+    # Models whose rows feed the dashboard, with the column linking them to a project
+    _DASHBOARD_VERSION_SOURCES = [
+        ('project.project', 'id'),
+        ('project.task', 'project_id'),
+        ('construction.project.budget.line', 'project_id'),
+        ('hr.expense', 'construction_project_id'),
+        ('construction.budget.alert', 'project_id'),
+    ]
+
+    # Activity feed icon per event type
+    _ACTIVITY_ICONS = {
+        'task': 'fa-tasks',
+        'expense': 'fa-money-bill',
+        'consumption': 'fa-cubes',
+        'receipt': 'fa-truck-loading',
+        'delivery': 'fa-truck',
+    }
+    _ACTIVITY_PAGE_SIZE = 15
+
     @api.model
     def get_dashboard_data(self, project_id=None):
         """Get comprehensive dashboard data for project manager"""
+        projects, current_project = self._get_dashboard_projects(project_id)
+        if not projects:
+            return {'error': 'No projects found for current user'}
+        return self._get_dashboard_payload(projects, current_project)
+
+    @api.model
+    def get_dashboard_sections(self, project_id=None, sections=None):
+        """Only the requested dashboard sections, for lazily loaded pages"""
+        projects, current_project = self._get_dashboard_projects(project_id)
+        if not projects:
+            return {'error': 'No projects found for current user'}
+        return self._get_dashboard_payload(projects, current_project, sections)
+
+    @api.model
+    def _get_dashboard_projects(self, project_id=None):
+        """Projects offered in the selector and the one being displayed"""
         user = self.env.user
 
         # Get projects where user is manager or has tasks
@@ -56,61 +102,204 @@ class PMDashboard(models.Model):
                 ('task_ids.user_ids', 'in', [user.id])  # Has assigned tasks
             ])
 
+        # Use first project if none selected
+        current_project = projects[:1] if not project_id else projects
+        return projects, current_project
+
+    def _get_dashboard_payload(self, projects, current_project, sections=None):
+        """Build the requested dashboard sections (default: all of them)"""
+        if sections is None:
+            sections = self._DASHBOARD_SECTIONS
+        sections = [section for section in self._DASHBOARD_SECTIONS if section in sections]
+
+        # Task board and team share one task read
+        task_payload = {}
+        if set(sections) & {'task_board', 'team_overview'}:
+            task_payload = self._build_dashboard_payload(current_project)
+
+        data = {}
+        for section in sections:
+            if section == 'projects':
+                data[section] = self._get_project_list(projects)
+            elif section == 'current_project':
+                data[section] = self._get_project_overview(current_project)
+            elif section == 'budget_monitor':
+                data[section] = self._get_budget_monitor_data(current_project)
+            elif section == 'recent_activity':
+                data[section] = self._get_recent_activity(current_project)
+            else:
+                data[section] = task_payload[section]
+        return data
+
+    @api.model
+    def _get_dashboard_version(self, projects):
+        """Cheap stamp that changes whenever the dashboard source rows change.
+
+        Row counts catch deletions and the sum of write dates catches every
+        update, whatever order concurrent transactions commit in.
+        """
+        selects = []
+        for model_name, column in self._DASHBOARD_VERSION_SOURCES:
+            Model = self.env[model_name]
+            Model.flush_model([column, 'write_date'])
+            selects.append(
+                f"(SELECT COUNT(*) || ':' || COALESCE(SUM(EXTRACT(EPOCH FROM write_date)), 0)"
+                f" FROM {Model._table} WHERE {column} IN %(project_ids)s)"
+            )
+        # Activity events are append-only, their highest id is their version
+        self.env['construction.activity.event'].flush_model(['project_id'])
+        selects.append(
+            "(SELECT MAX(id) FROM construction_activity_event WHERE project_id IN %(project_ids)s)"
+        )
+        # Stage, category and member names are shown without belonging to a project
+        for model_name in ('project.task.type', 'construction.budget.category', 'res.users', 'res.partner'):
+            Model = self.env[model_name]
+            Model.flush_model(['write_date'])
+            selects.append(f"(SELECT MAX(write_date)::text FROM {Model._table})")
+
+        self.env.cr.execute(f"SELECT {', '.join(selects)}", {'project_ids': tuple(projects.ids)})
+        return self.env.cr.fetchone()
+
+    def _get_dashboard_etag(self, projects, current_project, sections=None):
+        """ETag of the dashboard payload (sections) the current user would get"""
+        stamp = (
+            self.env.uid,
+            current_project.id,
+            tuple(projects.ids),
+            tuple(sorted(sections or ())),
+            self._get_dashboard_version(projects),
+            str(fields.Date.today()),  # deadlines are shown relative to today
+        )
+        return hashlib.sha1(repr(stamp).encode()).hexdigest()
+
+    @api.model
+    def get_cached_dashboard_data(self, project_id=None, etag=None, sections=None):
+        """Dashboard data with its ETag, rebuilt only when the data changed.
+
+        Returns ``(etag, data)``; ``data`` is None when ``etag`` is still
+        current, so unchanged polls cost a project lookup and one version
+        query. ``sections`` limits the payload to the given section names.
+        The returned data is shared with the cache and must not be modified.
+        """
+        projects, current_project = self._get_dashboard_projects(project_id)
         if not projects:
-            return {'error': 'No projects found for current user'}
+            return None, {'error': 'No projects found for current user'}
+
+        current_etag = self._get_dashboard_etag(projects, current_project, sections)
+        if etag == current_etag:
+            return current_etag, None
+
+        key = (self.env.cr.dbname, current_etag)
+        data = self._dashboard_cache.get(key)
+        if data is None:
+            data = self._get_dashboard_payload(projects, current_project, sections)
+            self._dashboard_cache[key] = data
+        return current_etag, data
+
+    _TASK_PAYLOAD_FIELDS = [
+        'name', 'stage_id', 'stage_kind', 'priority', 'user_ids', 'date_deadline', 'parent_id',
+    ]
+
+    def _build_dashboard_payload(self, project):
+        """Build the task-based dashboard sections from a single task read.
+
+        Tasks are read once with every field the task board and team
+        overview need; assignees and budget lines are then read
+        once per model and the per-section numbers are derived in memory.
+        """
+        if not project:
+            return {
+                'task_board': {'stages': [], 'tasks': []},
+                'team_overview': {},
+            }
 
-        # Use first project if none selected
-        current_project = projects[0] if not project_id else projects
+        Task = self.env['project.task']
+        task_fields = list(self._TASK_PAYLOAD_FIELDS)
+        has_budget_line = 'budget_line_id' in Task._fields
+        if has_budget_line:
+            task_fields.append('budget_line_id')
+        task_rows = Task.search_read([('project_id', '=', project.id)], task_fields)
 
-        return {
-            'projects': self._get_project_list(projects),
-            'current_project': self._get_project_overview(current_project),
-            'task_board': self._get_task_board_data(current_project),
-            'budget_monitor': self._get_budget_monitor_data(current_project),
-            'team_overview': self._get_team_overview(current_project),
-            'recent_activity': self._get_recent_activity(current_project),
+        stages = project.type_ids or self.env['project.task.type'].search([])
+
+        user_ids = {user_id for row in task_rows for user_id in row['user_ids']}
+        users = {
+            user['id']: user
+            for user in self.env['res.users'].browse(user_ids).read(['name', 'email', 'active'])
         }
 
-    def _get_project_list(self, projects):
-        """Get list of available projects for dropdown"""
-        return [{
-            'id': project.id,
-            'name': project.name,
-            'progress': self._calculate_project_progress(project),
-            'budget_status': self._get_project_budget_status(project),
-        } for project in projects]
+        budget_lines = {}
+        if has_budget_line:
+            line_ids = {row['budget_line_id'][0] for row in task_rows if row['budget_line_id']}
+            budget_lines = {
+                line['id']: line
+                for line in self.env['construction.project.budget.line'].browse(line_ids).read(
+                    ['budget_amount', 'spent_amount'])
+            }
+
+        # Single pass: stage counts and per-member stats
+        stage_counts = defaultdict(int)
+        member_stats = {}
+        for row in task_rows:
+            stage_id = row['stage_id'][0] if row['stage_id'] else None
+            stage_counts[stage_id] += 1
+            for user_id in row['user_ids']:
+                stats = member_stats.setdefault(user_id, {'total_tasks': 0, 'active_tasks': 0})
+                stats['total_tasks'] += 1
+                if row['stage_kind'] != 'done':
+                    stats['active_tasks'] += 1
+
+        task_board = {
+            'stages': [{
+                'id': stage.id,
+                'name': stage.name,
+                'sequence': stage.sequence,
+                'task_count': stage_counts[stage.id],
+            } for stage in stages],
+            'tasks': [
+                self._get_task_card(row, users, budget_lines.get(row['budget_line_id'][0])
+                                    if has_budget_line and row['budget_line_id'] else None)
+                for row in task_rows
+            ],
+        }
+
+        return {
+            'task_board': task_board,
+            'team_overview': self._get_team_overview(project, member_stats, users),
+        }
 
     def _get_project_overview(self, project):
-        """Get comprehensive project overview data"""
+        """Headline numbers of a project, from grouped counts only"""
         if not project:
             return {}
 
-        tasks = project.task_ids
-        total_tasks = len(tasks)
-
-        # Task status counts
-        todo_tasks = tasks.filtered(lambda t: t.stage_id.name.lower() in ['to do', 'new', 'draft'])
-        progress_tasks = tasks.filtered(lambda t: 'progress' in t.stage_id.name.lower() or 'doing' in t.stage_id.name.lower())
-        done_tasks = tasks.filtered(lambda t: t.stage_id.name.lower() in ['done', 'complete', 'closed'])
-
-        # Budget calculations
-        budget_info = self._get_project_budget_status(project)
+        Task = self.env['project.task']
+        domain = [('project_id', '=', project.id)]
+        kind_counts = defaultdict(int, Task._read_group(domain, ['stage_kind'], ['__count']))
+        total_tasks = sum(kind_counts.values())
 
         # Team stats
-        team_members = tasks.mapped('user_ids')
-        active_members = team_members.filtered(lambda u: u.active)
+        team_members = self.env['res.users'].union(*[
+            user for user, _count in Task._read_group(domain, ['user_ids'], ['__count'])
+        ])
+        active_members = team_members.filtered('active')
+        progress_members = self.env['res.users'].union(*[
+            user for user, _count in Task._read_group(
+                domain + [('stage_kind', '=', 'progress')], ['user_ids'], ['__count'])
+        ])
 
+        budget_info = self._get_project_budget_status(project)
         return {
             'id': project.id,
             'name': project.name,
             'description': project.description or '',
-            'progress_percentage': self._calculate_project_progress(project),
+            'progress_percentage': int(kind_counts['done'] / total_tasks * 100) if total_tasks else 0,
 
             # Task statistics
             'total_tasks': total_tasks,
-            'todo_count': len(todo_tasks),
-            'progress_count': len(progress_tasks),
-            'done_count': len(done_tasks),
+            'todo_count': kind_counts['todo'],
+            'progress_count': kind_counts['progress'],
+            'done_count': kind_counts['done'],
 
             # Budget information
             'budget_allocated': budget_info.get('allocated', 0),
@@ -121,83 +310,67 @@ class PMDashboard(models.Model):
 
             # Team information
             'team_size': len(active_members),
-            'active_workers': len(team_members.filtered(lambda u: u.id in progress_tasks.mapped('user_ids.id'))),
+            'active_workers': len(active_members & progress_members),
 
             # Timeline
             'deadline': project.date.strftime('%Y-%m-%d') if project.date else None,
             'days_remaining': (project.date - fields.Date.today()).days if project.date else None,
         }
 
-    def _get_task_board_data(self, project):
-        """Get Kanban board data for tasks"""
-        if not project:
-            return {'stages': [], 'tasks': []}
-
-        tasks = project.task_ids
-        stages = project.type_ids or self.env['project.task.type'].search([])
-
-        # Group tasks by stage
-        task_data = []
-        for task in tasks:
-            budget_info = self._get_task_budget_info(task)
-
-            task_data.append({
-                'id': task.id,
-                'name': task.name,
-                'stage_id': task.stage_id.id if task.stage_id else None,
-                'stage_name': task.stage_id.name if task.stage_id else 'No Stage',
-                'priority': task.priority,
-                'assignees': [{'id': u.id, 'name': u.name} for u in task.user_ids],
-                'deadline': task.date_deadline.strftime('%Y-%m-%d') if task.date_deadline else None,
-                'budget_allocated': budget_info.get('allocated', 0),
-                'budget_spent': budget_info.get('spent', 0),
-                'budget_percentage': budget_info.get('percentage', 0),
-                'is_over_budget': budget_info.get('over_budget', False),
-                'parent_task': task.parent_id.name if task.parent_id else None,
-            })
-
-        stages_data = [{
-            'id': stage.id,
-            'name': stage.name,
-            'sequence': stage.sequence,
-            'task_count': len(tasks.filtered(lambda t: t.stage_id.id == stage.id)),
-        } for stage in stages]
-
+    def _get_task_card(self, row, users, budget_line):
+        """Kanban card for a task row read by the payload builder"""
+        budget_info = self._get_budget_line_info(budget_line)
         return {
-            'stages': stages_data,
-            'tasks': task_data,
+            'id': row['id'],
+            'name': row['name'],
+            'stage_id': row['stage_id'][0] if row['stage_id'] else None,
+            'stage_name': row['stage_id'][1] if row['stage_id'] else 'No Stage',
+            'priority': row['priority'],
+            'assignees': [{'id': user_id, 'name': users[user_id]['name']}
+                          for user_id in row['user_ids'] if user_id in users],
+            'deadline': row['date_deadline'].strftime('%Y-%m-%d') if row['date_deadline'] else None,
+            'budget_allocated': budget_info['allocated'],
+            'budget_spent': budget_info['spent'],
+            'budget_percentage': budget_info['percentage'],
+            'is_over_budget': budget_info['over_budget'],
+            'parent_task': row['parent_id'][1] if row['parent_id'] else None,
         }
 
+    def _get_project_list(self, projects):
+        """Get list of available projects for dropdown"""
+        progress = self._get_projects_progress(projects)
+        budgets = self._get_projects_budget_status(projects)
+        return [{
+            'id': project.id,
+            'name': project.name,
+            'progress': progress.get(project.id, 0),
+            'budget_status': budgets[project.id],
+        } for project in projects]
+
     def _get_budget_monitor_data(self, project):
         """Get budget monitoring data with category breakdown"""
         if not project:
             return {}
 
-        # Get all budget lines for this project
-        budget_lines = self.env['construction.project.budget.line'].search([
-            ('budget_id.project_id', '=', project.id)
-        ])
-
-        # Category breakdown
+        # Category breakdown, aggregated in the database
+        groups = self.env['construction.project.budget.line']._read_group(
+            [('project_id', '=', project.id)],
+            ['category_id'],
+            ['budget_amount:sum', 'spent_amount:sum', '__count'],
+        )
         categories = {}
         total_allocated = 0
         total_spent = 0
+        for category, allocated, spent, count in groups:
+            cat_name = category.name if category else 'Uncategorized'
+            cat_data = categories.setdefault(cat_name, {'allocated': 0, 'spent': 0, 'count': 0})
+            allocated, spent = allocated or 0.0, spent or 0.0
+            cat_data['allocated'] += allocated
+            cat_data['spent'] += spent
+            cat_data['count'] += count
 
-        for line in budget_lines:
-            cat_name = line.category_id.name if line.category_id else 'Uncategorized'
-            if cat_name not in categories:
-                categories[cat_name] = {
-                    'allocated': 0,
-                    'spent': 0,
-                    'count': 0
-                }
-
-            categories[cat_name]['allocated'] += line.budget_amount
-            categories[cat_name]['spent'] += line.spent_amount
-            categories[cat_name]['count'] += 1
-
-            total_allocated += line.budget_amount
-            total_spent += line.spent_amount
+            total_allocated += allocated
+            total_spent += spent
 
         # Recent expenses
         recent_expenses = self.env['hr.expense'].search([
@@ -215,18 +388,14 @@ class PMDashboard(models.Model):
             'category': exp.budget_category_id.name if hasattr(exp, 'budget_category_id') and exp.budget_category_id else 'General',
         } for exp in recent_expenses]
 
-        # Budget alerts
-        alerts = []
-        for cat_name, cat_data in categories.items():
-            if cat_data['allocated'] > 0:
-                percentage = (cat_data['spent'] / cat_data['allocated']) * 100
-                if percentage > 90:
-                    alerts.append({
-                        'type': 'danger' if percentage > 100 else 'warning',
-                        'category': cat_name,
-                        'message': f"{cat_name} is {percentage:.1f}% of budget",
-                        'percentage': percentage
-                    })
+        # Budget alerts, precomputed by the alert evaluation
+        alerts = [{
+            'type': alert.severity,
+            'category': alert.category_id.name,
+            'message': f"{alert.category_id.name} is {alert.percentage:.1f}% of budget",
+            'percentage': alert.percentage,
+        } for alert in self.env['construction.budget.alert'].get_project_alerts(project.id)
+            if alert.category_id]
 
         return {
             'total_allocated': total_allocated,
@@ -238,150 +407,150 @@ class PMDashboard(models.Model):
             'pending_approvals': len(recent_expenses.filtered(lambda e: e.state == 'reported')),
         }
 
-    def _get_team_overview(self, project):
-        """Get team management overview"""
+    def _get_team_overview(self, project, member_stats, users):
+        """Get team management overview from per-member task stats"""
         if not project:
             return {}
 
-        # Get all team members from project tasks
-        team_members = project.task_ids.mapped('user_ids')
+        # Pending expenses of all members in one grouped query
+        pending_expenses = defaultdict(int)
+        if member_stats:
+            groups = self.env['hr.expense']._read_group(
+                [('construction_project_id', '=', project.id),
+                 ('state', '=', 'reported'),
+                 ('employee_id.user_id', 'in', list(member_stats))],
+                ['employee_id'],
+                ['__count'],
+            )
+            for employee, count in groups:
+                pending_expenses[employee.user_id.id] += count
+        last_seen = self.env['construction.activity.event'].get_last_seen(project.id, member_stats)
 
         team_data = []
-        for member in team_members:
-            member_tasks = project.task_ids.filtered(lambda t: member in t.user_ids)
-            active_tasks = member_tasks.filtered(lambda t: t.stage_id.name.lower() not in ['done', 'complete', 'closed'])
-
-            # Get recent expenses by this member
-            recent_expenses = self.env['hr.expense'].search([
-                ('employee_id.user_id', '=', member.id),
-                ('construction_project_id', '=', project.id),
-                ('state', '=', 'reported')
-            ])
-
+        for user_id, stats in member_stats.items():
+            if user_id not in users:
+                continue
             team_data.append({
-                'id': member.id,
-                'name': member.name,
-                'email': member.email,
-                'total_tasks': len(member_tasks),
-                'active_tasks': len(active_tasks),
-                'completed_tasks': len(member_tasks) - len(active_tasks),
-                'pending_expenses': len(recent_expenses),
-                'last_activity': self._get_user_last_activity(member, project),
+                'id': user_id,
+                'name': users[user_id]['name'],
+                'email': users[user_id]['email'],
+                'total_tasks': stats['total_tasks'],
+                'active_tasks': stats['active_tasks'],
+                'completed_tasks': stats['total_tasks'] - stats['active_tasks'],
+                'pending_expenses': pending_expenses[user_id],
+                'last_activity': last_seen[user_id].strftime('%Y-%m-%d') if user_id in last_seen else 'No recent activity',
             })
 
         return {
             'team_members': team_data,
-            'total_members': len(team_members),
+            'total_members': len(team_data),
             'active_members': len([m for m in team_data if m['active_tasks'] > 0]),
             'pending_expense_approvals': sum(m['pending_expenses'] for m in team_data),
         }
 
+    @api.model
+    def get_activity_feed(self, project_id, before_id=None, limit=None):
+        """Page of the project activity feed, older than event ``before_id``.
+
+        Returns ``{'activities', 'cursor', 'has_more'}``; pass ``cursor``
+        back as ``before_id`` to load the next page.
+        """
+        project = self.env['project.project'].browse(project_id)
+        if not project_id or not project.exists():
+            return {'activities': [], 'cursor': None, 'has_more': False}
+        project.check_access_rights('read')
+        project.check_access_rule('read')
+        return self._get_activity_page(project, before_id, limit)
+
     def _get_recent_activity(self, project):
         """Get recent project activity feed"""
         if not project:
             return []
+        return self._get_activity_page(project)['activities']
 
-        activities = []
-
-        # Recent task updates (last 7 days)
-        recent_tasks = self.env['project.task'].search([
-            ('project_id', '=', project.id),
-            ('write_date', '>=', fields.Datetime.now() - timedelta(days=7))
-        ], order='write_date desc', limit=10)
-
-        for task in recent_tasks:
-            activities.append({
-                'type': 'task',
-                'icon': 'fa-tasks',
-                'title': f"Task updated: {task.name}",
-                'description': f"Stage: {task.stage_id.name if task.stage_id else 'No Stage'}",
-                'user': task.user_ids[0].name if task.user_ids else 'Unassigned',
-                'date': task.write_date.strftime('%Y-%m-%d %H:%M'),
-                'priority': task.priority,
-            })
-
-        # Recent expenses
-        recent_expenses = self.env['hr.expense'].search([
-            ('construction_project_id', '=', project.id),
-            ('create_date', '>=', fields.Datetime.now() - timedelta(days=7))
-        ], order='create_date desc', limit=5)
-
-        for expense in recent_expenses:
-            activities.append({
-                'type': 'expense',
-                'icon': 'fa-money-bill',
-                'title': f"Expense: {expense.name}",
-                'description': f"Amount: ${expense.total_amount:.2f}",
-                'user': expense.employee_id.name,
-                'date': expense.create_date.strftime('%Y-%m-%d %H:%M'),
-                'state': expense.state,
-            })
-
-        # Sort by date and return latest
-        activities.sort(key=lambda x: x['date'], reverse=True)
-        return activities[:15]
+    def _get_activity_page(self, project, before_id=None, limit=None):
+        feed = self.env['construction.activity.event'].get_feed(
+            project.ids, before_id=before_id, limit=limit or self._ACTIVITY_PAGE_SIZE)
+        return {
+            'activities': [{
+                'id': event['id'],
+                'type': event['event_type'],
+                'icon': self._ACTIVITY_ICONS.get(event['event_type'], 'fa-info'),
+                'title': event['name'],
+                'description': event['description'] or '',
+                'user': event['user_id'][1] if event['user_id'] else '',
+                'date': event['date'].strftime('%Y-%m-%d %H:%M'),
+                'res_model': event['res_model'],
+                'res_id': event['res_id'],
+            } for event in feed['events']],
+            'cursor': feed['cursor'],
+            'has_more': feed['has_more'],
+        }
 
     # Helper methods
+    def _get_projects_progress(self, projects):
+        """Done-task percentage per project, from one grouped count"""
+        groups = self.env['project.task']._read_group(
+            [('project_id', 'in', projects.ids)],
+            ['project_id', 'stage_kind'],
+            ['__count'],
+        )
+        totals = defaultdict(int)
+        done = defaultdict(int)
+        for project, stage_kind, count in groups:
+            totals[project.id] += count
+            if stage_kind == 'done':
+                done[project.id] += count
+        return {
+            project_id: int(done[project_id] / total * 100)
+            for project_id, total in totals.items() if total
+        }
+
     def _calculate_project_progress(self, project):
         """Calculate overall project progress percentage"""
-        if not project or not project.task_ids:
+        if not project:
             return 0
-
-        total_tasks = len(project.task_ids)
-        completed_tasks = len(project.task_ids.filtered(
-            lambda t: t.stage_id.name.lower() in ['done', 'complete', 'closed']
-        ))
-
-        return int((completed_tasks / total_tasks) * 100) if total_tasks > 0 else 0
+        return self._get_projects_progress(project).get(project.id, 0)
+
+    def _get_projects_budget_status(self, projects):
+        """Budget status summary per project, from one grouped sum"""
+        groups = self.env['construction.project.budget.line']._read_group(
+            [('project_id', 'in', projects.ids)],
+            ['project_id'],
+            ['budget_amount:sum', 'spent_amount:sum'],
+        )
+        sums = {project.id: (allocated or 0.0, spent or 0.0) for project, allocated, spent in groups}
+        result = {}
+        for project in projects:
+            allocated, spent = sums.get(project.id, (0, 0))
+            result[project.id] = {
+                'allocated': allocated,
+                'spent': spent,
+                'remaining': allocated - spent,
+                'percentage': (spent / allocated * 100) if allocated > 0 else 0,
+                'over_budget': spent > allocated
+            }
+        return result
 
     def _get_project_budget_status(self, project):
         """Get project budget status summary"""
         if not project:
             return {'allocated': 0, 'spent': 0, 'remaining': 0, 'percentage': 0, 'over_budget': False}
-
-        budget_lines = self.env['construction.project.budget.line'].search([
-            ('budget_id.project_id', '=', project.id)
-        ])
-
-        allocated = sum(budget_lines.mapped('budget_amount'))
-        spent = sum(budget_lines.mapped('spent_amount'))
-        remaining = allocated - spent
-        percentage = (spent / allocated * 100) if allocated > 0 else 0
-
+        return self._get_projects_budget_status(project)[project.id]
+
+    def _get_budget_line_info(self, line):
+        """Budget figures of a budget line read as a dict"""
+        if not line:
+            return {'allocated': 0, 'spent': 0, 'percentage': 0, 'over_budget': False}
+        allocated = line['budget_amount']
+        spent = line['spent_amount']
         return {
             'allocated': allocated,
             'spent': spent,
-            'remaining': remaining,
-            'percentage': percentage,
+            'percentage': (spent / allocated * 100) if allocated > 0 else 0,
             'over_budget': spent > allocated
         }
 
-    def _get_task_budget_info(self, task):
-        """Get budget information for a specific task"""
-        if hasattr(task, 'budget_line_id') and task.budget_line_id:
-            line = task.budget_line_id
-            percentage = (line.spent_amount / line.budget_amount * 100) if line.budget_amount > 0 else 0
-            return {
-                'allocated': line.budget_amount,
-                'spent': line.spent_amount,
-                'percentage': percentage,
-                'over_budget': line.spent_amount > line.budget_amount
-            }
-        return {'allocated': 0, 'spent': 0, 'percentage': 0, 'over_budget': False}
-
-    def _get_user_last_activity(self, user, project):
-        """Get user's last activity in the project"""
-        # Check last task update
-        last_task_update = self.env['project.task'].search([
-            ('project_id', '=', project.id),
-            ('user_ids', 'in', [user.id])
-        ], order='write_date desc', limit=1)
-
-        if last_task_update:
-            return last_task_update.write_date.strftime('%Y-%m-%d')
-
-        return 'No recent activity'
-
     def action_load_dashboard_data(self):
         """Load dashboard data for selected project"""
         if not self.project_id:
@@ -429,4 +598,4 @@ class PMDashboard(models.Model):
     @api.model
     def refresh_dashboard(self, project_id=None):
         """Refresh dashboard data"""
-        return self.get_dashboard_data(project_id)
\ No newline at end of file
+        return self.get_cached_dashboard_data(project_id)[1]
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 from odoo import models, fields, api
 import logging
+from collections import defaultdict
 
 _logger = logging.getLogger(__name__)
 
@@ -14,9 +15,22 @@ class PMTaskBoard(models.Model):
     project_id = fields.Many2one('project.project', string='Project', required=True)
     user_id = fields.Many2one('res.users', string='Project Manager', default=lambda self: self.env.user)
 
+    # Cards loaded per column before the client asks for more
+    _BOARD_PAGE_SIZE = 20
+
+    _CARD_FIELDS = [
+        'name', 'description', 'stage_id', 'stage_kind', 'priority', 'user_ids',
+        'date_deadline', 'parent_id', 'child_ids', 'tag_ids', 'write_date',
+    ]
+
     @api.model
-    def get_board_data(self, project_id, filters=None):
-        """Get Kanban board data with optional filters"""
+    def get_board_data(self, project_id, filters=None, limit=None):
+        """Get Kanban board data with optional filters.
+
+        Stage counts come from one grouped query and only the first
+        ``limit`` cards of each column are returned; each stage carries a
+        ``next_offset`` cursor for :meth:`get_stage_tasks` when it has more.
+        """
         if not project_id:
             return {'stages': [], 'tasks': []}
 
@@ -24,7 +38,58 @@ class PMTaskBoard(models.Model):
         if not project.exists():
             return {'stages': [], 'tasks': []}
 
-        # Apply filters
+        limit = limit or self._BOARD_PAGE_SIZE
+        domain = self._get_board_domain(project_id, filters)
+        stages = project.type_ids or self.env['project.task.type'].search([])
+        stages_data = self._get_stages_data(stages, domain)
+
+        # Ids of the first cards of each non-empty column, then one read for all
+        Task = self.env['project.task']
+        task_ids = []
+        for stage in stages_data:
+            if stage['task_count']:
+                stage_domain = domain + [('stage_id', '=', stage['id'] or False)]
+                task_ids += Task.search(stage_domain, limit=limit).ids
+                if stage['task_count'] > limit:
+                    stage['next_offset'] = limit
+
+        return {
+            'stages': stages_data,
+            'tasks': self._get_tasks_data(task_ids),
+            'filters': self._get_filter_options(project),
+        }
+
+    @api.model
+    def get_stage_tasks(self, project_id, stage_id, offset=0, limit=None, filters=None):
+        """Next page of cards of one board column ("load more")"""
+        limit = limit or self._BOARD_PAGE_SIZE
+        domain = self._get_board_domain(project_id, filters) + [('stage_id', '=', stage_id or False)]
+        task_ids = self.env['project.task'].search(domain, offset=offset, limit=limit + 1).ids
+        has_more = len(task_ids) > limit
+        return {
+            'stage_id': stage_id,
+            'tasks': self._get_tasks_data(task_ids[:limit]),
+            'next_offset': offset + limit if has_more else None,
+        }
+
+    @api.model
+    def get_board_changes(self, project_id, since=None, filters=None):
+        """Cards created, changed, moved or deleted since the previous sync.
+
+        ``since`` is the ``cursor`` returned by the previous call (none for a
+        first sync). Returns ``tasks`` to upsert, ``removed`` card ids, the
+        next ``cursor``, ``has_more`` and ``reset`` (drop local state).
+        """
+        scope = [('project_id', '=', project_id)]
+        changes = self.env['project.task']._get_task_changes(
+            scope, scope,
+            since=since,
+            filter_domain=self._get_board_domain(project_id, filters),
+        )
+        return dict(changes, tasks=self._get_tasks_data(changes['tasks'].ids))
+
+    def _get_board_domain(self, project_id, filters=None):
+        """Task domain of a board with its optional filters applied"""
         domain = [('project_id', '=', project_id)]
         if filters:
             if filters.get('user_id'):
@@ -35,102 +100,134 @@ class PMTaskBoard(models.Model):
                 domain.append(('date_deadline', '>=', filters['date_from']))
             if filters.get('date_to'):
                 domain.append(('date_deadline', '<=', filters['date_to']))
+        return domain
 
-        tasks = self.env['project.task'].search(domain)
-        stages = project.type_ids or self.env['project.task.type'].search([])
-
-        return {
-            'stages': self._get_stages_data(stages, tasks),
-            'tasks': self._get_tasks_data(tasks),
-            'filters': self._get_filter_options(project),
+    def _get_stages_data(self, stages, domain):
+        """Get stage data with task counts from one grouped query"""
+        counts = {
+            stage.id: count
+            for stage, count in self.env['project.task']._read_group(domain, ['stage_id'], ['__count'])
         }
-
-    def _get_stages_data(self, stages, tasks):
-        """Get stage data with task counts"""
-        stages_data = []
-        for stage in stages:
-            stage_tasks = tasks.filtered(lambda t: t.stage_id.id == stage.id)
-            stages_data.append({
-                'id': stage.id,
-                'name': stage.name,
-                'sequence': stage.sequence,
-                'task_count': len(stage_tasks),
-                'fold': stage.fold if hasattr(stage, 'fold') else False,
-            })
+        stages_data = [{
+            'id': stage.id,
+            'name': stage.name,
+            'sequence': stage.sequence,
+            'task_count': counts.get(stage.id, 0),
+            'fold': stage.fold if hasattr(stage, 'fold') else False,
+            'next_offset': None,
+        } for stage in stages]
 
         # Add tasks without stage
-        unassigned_tasks = tasks.filtered(lambda t: not t.stage_id)
-        if unassigned_tasks:
+        if counts.get(False):
             stages_data.append({
                 'id': 0,
                 'name': 'Unassigned',
                 'sequence': 999,
-                'task_count': len(unassigned_tasks),
+                'task_count': counts[False],
                 'fold': False,
+                'next_offset': None,
             })
 
         return sorted(stages_data, key=lambda x: x['sequence'])
 
-    def _get_tasks_data(self, tasks):
-        """Get detailed task data for Kanban cards"""
+    def _get_tasks_data(self, task_ids):
+        """Get Kanban card data for the given tasks with a single search_read.
+
+        Related names (assignees, tags, budget lines) are read once per
+        model for the whole page instead of once per card.
+        """
+        Task = self.env['project.task']
+        card_fields = list(self._CARD_FIELDS)
+        has_budget_line = 'budget_line_id' in Task._fields
+        if has_budget_line:
+            card_fields.append('budget_line_id')
+        rows = Task.search_read([('id', 'in', list(task_ids))], card_fields)
+
+        users = {
+            user['id']: user['name']
+            for user in self.env['res.users'].browse(
+                {user_id for row in rows for user_id in row['user_ids']}).read(['name'])
+        }
+        tags = {
+            tag['id']: tag['name']
+            for tag in self.env['project.tags'].browse(
+                {tag_id for row in rows for tag_id in row['tag_ids']}).read(['name'])
+        }
+        budget_lines = {}
+        if has_budget_line:
+            budget_lines = {
+                line['id']: line
+                for line in self.env['construction.project.budget.line'].browse(
+                    {row['budget_line_id'][0] for row in rows if row['budget_line_id']}
+                ).read(['budget_amount', 'spent_amount'])
+            }
+        priority_labels = dict(Task._fields['priority'].selection)
+
         tasks_data = []
-        for task in tasks:
-            budget_info = self._get_task_budget_info(task)
+        for row in rows:
+            budget_line = budget_lines.get(row['budget_line_id'][0]) if has_budget_line and row['budget_line_id'] else None
+            budget_info = self._get_budget_line_info(budget_line)
+            deadline = row['date_deadline']
 
             tasks_data.append({
-                'id': task.id,
-                'name': task.name,
-                'description': task.description or '',
-                'stage_id': task.stage_id.id if task.stage_id else 0,
-                'stage_name': task.stage_id.name if task.stage_id else 'Unassigned',
-                'priority': task.priority,
-                'priority_label': dict(task._fields['priority'].selection).get(task.priority, 'Normal'),
+                'id': row['id'],
+                'name': row['name'],
+                'description': row['description'] or '',
+                'stage_id': row['stage_id'][0] if row['stage_id'] else 0,
+                'stage_name': row['stage_id'][1] if row['stage_id'] else 'Unassigned',
+                'priority': row['priority'],
+                'priority_label': priority_labels.get(row['priority'], 'Normal'),
 
                 # Assignees
                 'assignees': [{
-                    'id': user.id,
-                    'name': user.name,
-                    'avatar': f'/web/image/res.users/{user.id}/avatar_128',
-                } for user in task.user_ids],
+                    'id': user_id,
+                    'name': users[user_id],
+                    'avatar': f'/web/image/res.users/{user_id}/avatar_128',
+                } for user_id in row['user_ids'] if user_id in users],
 
                 # Dates
-                'deadline': task.date_deadline.strftime('%Y-%m-%d') if task.date_deadline else None,
-                'deadline_label': self._format_deadline(task.date_deadline),
-                'is_overdue': self._is_task_overdue(task),
+                'deadline': deadline.strftime('%Y-%m-%d') if deadline else None,
+                'deadline_label': self._format_deadline(deadline),
+                'is_overdue': self._is_overdue(deadline),
 
                 # Budget information
-                'budget_allocated': budget_info.get('allocated', 0),
-                'budget_spent': budget_info.get('spent', 0),
-                'budget_remaining': budget_info.get('remaining', 0),
-                'budget_percentage': budget_info.get('percentage', 0),
-                'is_over_budget': budget_info.get('over_budget', False),
-                'has_budget': budget_info.get('allocated', 0) > 0,
+                'budget_allocated': budget_info['allocated'],
+                'budget_spent': budget_info['spent'],
+                'budget_remaining': budget_info['remaining'],
+                'budget_percentage': budget_info['percentage'],
+                'is_over_budget': budget_info['over_budget'],
+                'has_budget': budget_info['allocated'] > 0,
 
                 # Hierarchy
-                'parent_task': task.parent_id.name if task.parent_id else None,
-                'child_count': len(task.child_ids),
+                'parent_task': row['parent_id'][1] if row['parent_id'] else None,
+                'child_count': len(row['child_ids']),
 
                 # Activity
-                'activity_count': self._get_task_activity_count(task),
-                'last_update': task.write_date.strftime('%Y-%m-%d') if task.write_date else None,
+                'activity_count': 0,
+                'last_update': row['write_date'].strftime('%Y-%m-%d') if row['write_date'] else None,
 
                 # Status indicators
-                'color': self._get_task_color(task),
-                'tags': [tag.name for tag in task.tag_ids] if hasattr(task, 'tag_ids') else [],
+                'color': self._get_task_color(row),
+                'tags': [tags[tag_id] for tag_id in row['tag_ids'] if tag_id in tags],
             })
 
         return tasks_data
 
     def _get_filter_options(self, project):
         """Get available filter options"""
+        Task = self.env['project.task']
+        domain = [('project_id', '=', project.id)]
+
         # Get all users assigned to project tasks
-        users = project.task_ids.mapped('user_ids')
+        users = self.env['res.users'].union(*[
+            user for user, _count in Task._read_group(domain, ['user_ids'], ['__count'])
+        ])
 
         # Get all priorities used in project
-        priorities = project.task_ids.mapped('priority')
+        priority_labels = dict(Task._fields['priority'].selection)
         priority_options = [
-            {'value': p, 'label': dict(self.env['project.task']._fields['priority'].selection).get(p, p)}
-            for p in set(priorities) if p
+            {'value': priority, 'label': priority_labels.get(priority, priority)}
+            for priority, _count in Task._read_group(domain, ['priority'], ['__count']) if priority
         ]
 
         return {
@@ -138,12 +235,11 @@ class PMTaskBoard(models.Model):
             'priorities': priority_options,
         }
 
-    def _get_task_budget_info(self, task):
-        """Get budget information for a task"""
-        if hasattr(task, 'budget_line_id') and task.budget_line_id:
-            line = task.budget_line_id
-            allocated = line.budget_amount
-            spent = line.spent_amount
+    def _get_budget_line_info(self, line):
+        """Get budget information of a budget line read as a dict"""
+        if line:
+            allocated = line['budget_amount']
+            spent = line['spent_amount']
             remaining = allocated - spent
             percentage = (spent / allocated * 100) if allocated > 0 else 0
 
@@ -181,26 +277,21 @@ class PMTaskBoard(models.Model):
         else:
             return deadline.strftime('%b %d, %Y')
 
-    def _is_task_overdue(self, task):
-        """Check if task is overdue"""
-        if not task.date_deadline:
+    def _is_overdue(self, deadline):
+        """Check if a deadline is past"""
+        if not deadline:
             return False
-        return task.date_deadline < fields.Date.today()
-
-    def _get_task_activity_count(self, task):
-        """Get recent activity count for task"""
-        # Count recent messages/activities (simplified)
-        return 0
+        return deadline < fields.Date.today()
 
-    def _get_task_color(self, task):
+    def _get_task_color(self, row):
         """Get color for task card based on status"""
-        if self._is_task_overdue(task):
+        if self._is_overdue(row['date_deadline']):
             return 'danger'
-        elif task.priority == '1':  # High priority
+        elif row['priority'] == '1':  # High priority
             return 'warning'
-        elif task.stage_id and 'done' in task.stage_id.name.lower():
+        elif row['stage_kind'] == 'done':
             return 'success'
-        elif task.stage_id and 'progress' in task.stage_id.name.lower():
+        elif row['stage_kind'] == 'progress':
             return 'info'
         return 'light'
 
@@ -276,6 +367,73 @@ class PMTaskBoard(models.Model):
             _logger.error(f"Error assigning user to task {task_id}: {str(e)}")
             return {'success': False, 'message': 'Failed to assign user'}
 
+    @api.model
+    def apply_board_operations(self, operations):
+        """Apply a list of board operations in one transaction.
+
+        Each operation is a dict with an ``op`` key:
+
+        * ``move``: ``task_id``, ``stage_id`` (0 for "Unassigned")
+        * ``priority``: ``task_id``, ``priority``
+        * ``assign``: ``task_id``, ``user_id``
+        * ``resequence``: ``task_ids`` in their new column order
+
+        Later operations on the same task win. Tasks are written once per
+        target value rather than once per operation, and either every
+        operation is applied or none is. Returns the resulting cards.
+        """
+        Task = self.env['project.task']
+        moves, priorities, sequences = {}, {}, {}
+        assignments = defaultdict(set)
+        for operation in operations:
+            op = operation.get('op')
+            if op == 'move':
+                moves[operation['task_id']] = operation['stage_id'] or False
+            elif op == 'priority':
+                priorities[operation['task_id']] = operation['priority']
+            elif op == 'assign':
+                assignments[operation['user_id']].add(operation['task_id'])
+            elif op == 'resequence':
+                for sequence, task_id in enumerate(operation['task_ids'], start=1):
+                    sequences[task_id] = sequence
+            else:
+                return {'success': False, 'message': f'Unknown operation: {op}'}
+
+        task_ids = set(moves) | set(priorities) | set(sequences) | {
+            task_id for user_task_ids in assignments.values() for task_id in user_task_ids
+        }
+        tasks = Task.browse(task_ids).exists()
+        if len(tasks) != len(task_ids):
+            return {'success': False, 'message': 'Task not found'}
+        stage_ids = {stage_id for stage_id in moves.values() if stage_id}
+        if len(self.env['project.task.type'].browse(stage_ids).exists()) != len(stage_ids):
+            return {'success': False, 'message': 'Stage not found'}
+        if len(self.env['res.users'].browse(list(assignments)).exists()) != len(assignments):
+            return {'success': False, 'message': 'User not found'}
+        priority_values = dict(Task._fields['priority'].selection)
+        if any(priority not in priority_values for priority in priorities.values()):
+            return {'success': False, 'message': 'Invalid priority'}
+
+        try:
+            with self.env.cr.savepoint():
+                for field_name, values in (('stage_id', moves), ('priority', priorities), ('sequence', sequences)):
+                    task_ids_by_value = defaultdict(list)
+                    for task_id, value in values.items():
+                        task_ids_by_value[value].append(task_id)
+                    for value, value_task_ids in task_ids_by_value.items():
+                        Task.browse(value_task_ids).write({field_name: value})
+                for user_id, user_task_ids in assignments.items():
+                    Task.browse(list(user_task_ids)).write({'user_ids': [(4, user_id)]})
+        except Exception as e:
+            _logger.error(f"Error applying board operations: {str(e)}")
+            return {'success': False, 'message': 'Failed to update tasks'}
+
+        return {
+            'success': True,
+            'message': f'{len(operations)} changes applied to {len(tasks)} tasks',
+            'tasks': self._get_tasks_data(tasks.ids),
+        }
+
     @api.model
     def create_quick_task(self, project_id, name, stage_id=None, user_id=None):
         """Create a quick task from the board"""
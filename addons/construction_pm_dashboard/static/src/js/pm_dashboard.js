@@ -4,6 +4,10 @@ import { registry } from "@web/core/registry";
 import { Component, onMounted, onWillUnmount, useState } from "@odoo/owl";
 import { useService } from "@web/core/utils/hooks";
 
+// Sections shown on the page: the overview renders first, details follow
+const OVERVIEW_SECTIONS = ["projects", "current_project"];
+const DETAIL_SECTIONS = ["budget_monitor", "team_overview", "recent_activity"];
+
 export class PMDashboard extends Component {
     setup() {
         this.state = useState({
@@ -34,41 +38,86 @@ export class PMDashboard extends Component {
 
     async loadDashboard(projectId = null) {
         this.state.loading = true;
+        // ETags are per project and per set of sections
+        this.etags = {};
+        this.state.dashboardData = {};
         try {
-            const data = await this.rpc("/pm_dashboard/data", {
-                project_id: projectId
-            });
-
-            if (data.error) {
-                this.notification.add(data.error, { type: "warning" });
-                return;
+            // Overview first so the page renders quickly
+            const data = await this.fetchSections(OVERVIEW_SECTIONS, projectId);
+            if (data) {
+                this.state.projects = data.projects || [];
+                this.state.currentProject = data.current_project || {};
+                this.state.lastRefresh = new Date();
             }
-
-            this.state.projects = data.projects || [];
-            this.state.currentProject = data.current_project || {};
-            this.state.dashboardData = data;
-            this.state.lastRefresh = new Date();
-
         } catch (error) {
             console.error("Error loading dashboard:", error);
             this.notification.add("Failed to load dashboard data", { type: "danger" });
         } finally {
             this.state.loading = false;
         }
+
+        // Heavier sections are fetched in parallel once the overview is shown
+        if (this.state.currentProject?.id) {
+            this.loadSections(DETAIL_SECTIONS);
+        }
     }
 
-    async refreshDashboard() {
+    async loadSections(sections) {
         const projectId = this.state.currentProject?.id;
+        await Promise.all(sections.map((section) => this.loadSection(section, projectId)));
+    }
+
+    async loadSection(section, projectId = this.state.currentProject?.id) {
         try {
-            const data = await this.rpc("/pm_dashboard/refresh", {
-                project_id: projectId
-            });
+            return await this.fetchSections([section], projectId);
+        } catch (error) {
+            console.error(`Error loading dashboard section ${section}:`, error);
+            return null;
+        }
+    }
 
-            if (!data.error) {
-                this.state.dashboardData = data;
-                this.state.currentProject = data.current_project || {};
-                this.state.lastRefresh = new Date();
+    /**
+     * Fetch the given sections, sending the ETag of their last answer.
+     * Returns the new data, or null when unchanged, failed or outdated.
+     */
+    async fetchSections(sections, projectId) {
+        const key = sections.join(",");
+        const data = await this.rpc("/pm_dashboard/sections", {
+            project_id: projectId,
+            sections,
+            etag: this.etags[key] || null,
+        });
+        if (data.error) {
+            this.notification.add(data.error, { type: "warning" });
+            return null;
+        }
+        // Ignore late answers for a project that is no longer displayed
+        if (data.not_modified || (projectId && projectId !== this.state.currentProject?.id)) {
+            return null;
+        }
+        this.etags[key] = data.etag || null;
+        const sectionData = Object.fromEntries(sections.map((section) => [section, data[section]]));
+        this.state.dashboardData = { ...this.state.dashboardData, ...sectionData };
+        return data;
+    }
 
+    async refreshDashboard() {
+        // Poll the sections on screen, each with its own ETag, so unchanged
+        // ones answer not_modified and nothing else is rebuilt
+        const projectId = this.state.currentProject?.id;
+        try {
+            const results = await Promise.all([
+                this.fetchSections(OVERVIEW_SECTIONS, projectId),
+                ...DETAIL_SECTIONS.map((section) => this.fetchSections([section], projectId)),
+            ]);
+            this.state.lastRefresh = new Date();
+
+            const overview = results[0];
+            if (overview) {
+                this.state.projects = overview.projects || [];
+                this.state.currentProject = overview.current_project || {};
+            }
+            if (results.some(Boolean)) {
                 this.notification.add("Dashboard refreshed", {
                     type: "success",
                     sticky: false
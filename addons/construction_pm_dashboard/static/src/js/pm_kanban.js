@@ -4,12 +4,60 @@ import { KanbanView } from "@web/views/kanban/kanban_view";
 import { KanbanController } from "@web/views/kanban/kanban_controller";
 import { KanbanRenderer } from "@web/views/kanban/kanban_renderer";
 import { registry } from "@web/core/registry";
+import { onWillUnmount } from "@odoo/owl";
 
 export class PMKanbanController extends KanbanController {
     setup() {
         super.setup();
         this.rpc = this.env.services.rpc;
         this.notification = this.env.services.notification;
+        this.busService = this.env.services.bus_service;
+
+        // Task changes of this project are pushed instead of polled
+        this.projectId = parseInt(this.props.context.default_project_id) || null;
+        if (this.projectId) {
+            this.busChannel = `construction_project_${this.projectId}`;
+            this.busService.addChannel(this.busChannel);
+            this.onTaskUpdate = (payload) => this.applyTaskPatches(payload.tasks);
+            this.busService.subscribe("construction_task_update", this.onTaskUpdate);
+            onWillUnmount(() => {
+                this.busService.unsubscribe("construction_task_update", this.onTaskUpdate);
+                this.busService.deleteChannel(this.busChannel);
+            });
+        }
+    }
+
+    async applyTaskPatches(patches) {
+        // Reload only the changed cards; a card changing column needs its groups reloaded.
+        // Patches of the user's own tasks also arrive for other projects: a card
+        // moved away from this board is a removal, other projects' tasks are ignored.
+        const records = this.getLoadedRecords();
+        let reloadAll = false;
+        for (const patch of patches) {
+            const removed = patch.removed || patch.project_id !== this.projectId;
+            const record = records.find((r) => r.resId === patch.id);
+            if (!record) {
+                reloadAll = reloadAll || !removed;
+                continue;
+            }
+            const stageId = record.data.stage_id && record.data.stage_id[0];
+            if (removed || stageId !== (patch.stage_id || false)) {
+                reloadAll = true;
+            } else {
+                await record.load();
+            }
+        }
+        if (reloadAll) {
+            await this.model.load();
+        }
+    }
+
+    getLoadedRecords() {
+        const root = this.model.root;
+        if (root.isGrouped) {
+            return root.groups.flatMap((group) => group.list.records);
+        }
+        return root.records;
     }
 
     async moveTask(taskId, newStageId) {
@@ -69,6 +117,64 @@ export class PMKanbanController extends KanbanController {
         }
     }
 
+    async applyBatch(operations) {
+        // operations: [{op: "move"|"priority"|"assign"|"resequence", ...}]
+        try {
+            const result = await this.rpc("/pm_dashboard/batch_update_tasks", {
+                operations: operations
+            });
+
+            if (result.success) {
+                this.notification.add(result.message, { type: "success" });
+                await this.reload();
+            } else {
+                this.notification.add(result.message, { type: "danger" });
+            }
+            return result;
+        } catch (error) {
+            console.error("Error applying board changes:", error);
+            this.notification.add("Failed to update tasks", { type: "danger" });
+            return { success: false };
+        }
+    }
+
+    async loadMoreTasks(projectId, stageId, offset) {
+        // Next page of cards of one board column; null offset means no more
+        try {
+            return await this.rpc("/pm_dashboard/task_board/stage_tasks", {
+                project_id: projectId,
+                stage_id: stageId,
+                offset: offset
+            });
+        } catch (error) {
+            console.error("Error loading tasks:", error);
+            this.notification.add("Failed to load more tasks", { type: "danger" });
+            return { tasks: [], next_offset: null };
+        }
+    }
+
+    async syncBoard(projectId, board) {
+        // Apply server-side changes since board.cursor to a local {tasks, cursor} state
+        let changes;
+        do {
+            changes = await this.rpc("/pm_dashboard/task_board/changes", {
+                project_id: projectId,
+                since: board.cursor || null
+            });
+            if (changes.reset) {
+                board.tasks = {};
+            }
+            for (const taskId of changes.removed) {
+                delete board.tasks[taskId];
+            }
+            for (const task of changes.tasks) {
+                board.tasks[task.id] = task;
+            }
+            board.cursor = changes.cursor;
+        } while (changes.has_more);
+        return board;
+    }
+
     async createQuickTask(projectId, name, stageId = null, userId = null) {
         try {
             const result = await this.rpc("/pm_dashboard/create_quick_task", {
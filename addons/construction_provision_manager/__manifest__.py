@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'Construction Provision Manager',
-    'version': '1.0.0',
+    'version': '1.0.1',
     'category': 'Project',
     'summary': 'Materials provisioning and inventory management for construction projects',
     'description': """
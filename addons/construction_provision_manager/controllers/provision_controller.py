@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+from odoo import http
+from odoo.http import request
+
+
+class ProvisionController(http.Controller):
+
+    @http.route('/construction_provision/cost_summary', type='json', auth='user')
+    def get_cost_summary(self, date_from=None, date_to=None, project_ids=None, category_ids=None,
+                         groupby=None, period=None):
+        """Delivery cost summary grouped by project/category/supplier and period"""
+        domain = []
+        if date_from:
+            domain.append(('delivery_date', '>=', date_from))
+        if date_to:
+            domain.append(('delivery_date', '<=', date_to))
+        if project_ids:
+            domain.append(('project_id', 'in', project_ids))
+        if category_ids:
+            domain.append(('category_id', 'in', category_ids))
+
+        delivery = request.env['construction.material.delivery']
+        return delivery.get_cost_summary(domain, groupby or ['project', 'category'], period)
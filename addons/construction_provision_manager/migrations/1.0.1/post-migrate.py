@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Rebuild inventory totals, which used to be stale stored computes"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['construction.project.material']._refresh_inventory()
@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from datetime import datetime
 
 
+def normalize_material_key(name):
+    """Case- and whitespace-insensitive key used to match deliveries to inventory"""
+    return ' '.join((name or '').split()).lower()
+
+
 class MaterialDelivery(models.Model):
     _name = 'construction.material.delivery'
     _description = 'Material Delivery to Project'
@@ -23,6 +28,13 @@ class MaterialDelivery(models.Model):
         required=True,
         help='Name of the delivered material'
     )
+    material_key = fields.Char(
+        string='Material Key',
+        compute='_compute_material_key',
+        store=True,
+        index=True,
+        help='Normalized material name used to group deliveries per project'
+    )
     category_id = fields.Many2one(
         'construction.material.category',
         string='Category',
@@ -111,6 +123,11 @@ class MaterialDelivery(models.Model):
         tracking=True,
         help='Quantity already consumed/used'
     )
+    last_consumption_date = fields.Datetime(
+        string='Last Consumption',
+        readonly=True,
+        help='When material from this delivery was last consumed'
+    )
     remaining_quantity = fields.Float(
         string='Remaining Quantity',
         compute='_compute_remaining_quantity',
@@ -125,6 +142,61 @@ class MaterialDelivery(models.Model):
         store=True
     )
 
+    # Fields feeding construction.project.material totals
+    _INVENTORY_FIELDS = {
+        'project_id', 'material_name', 'quantity', 'consumed_quantity',
+        'unit_price', 'delivery_date', 'last_consumption_date',
+    }
+
+    def init(self):
+        tools.create_index(
+            self._cr, 'construction_material_delivery_project_key_index',
+            self._table, ['project_id', 'material_key'],
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        deliveries = super().create(vals_list)
+        self.env['construction.project.material']._refresh_inventory(deliveries._get_inventory_keys())
+        deliveries._log_activity_events()
+        return deliveries
+
+    def write(self, vals):
+        if not self._INVENTORY_FIELDS & set(vals):
+            res = super().write(vals)
+        else:
+            keys = self._get_inventory_keys()
+            res = super().write(vals)
+            self.env['construction.project.material']._refresh_inventory(keys | self._get_inventory_keys())
+        if 'state' in vals:
+            self._log_activity_events()
+        return res
+
+    def unlink(self):
+        keys = self._get_inventory_keys()
+        res = super().unlink()
+        self.env['construction.project.material']._refresh_inventory(keys)
+        return res
+
+    def _log_activity_events(self):
+        state_labels = dict(self._fields['state'].selection)
+        self.env['construction.activity.event']._log([{
+            'project_id': delivery.project_id.id,
+            'event_type': 'delivery',
+            'name': f"Delivery: {delivery.material_name}",
+            'description': f"{delivery.quantity} {delivery.unit} - {state_labels[delivery.state]}",
+            'res_model': delivery._name,
+            'res_id': delivery.id,
+        } for delivery in self])
+
+    def _get_inventory_keys(self):
+        return {(delivery.project_id.id, delivery.material_key) for delivery in self}
+
+    @api.depends('material_name')
+    def _compute_material_key(self):
+        for delivery in self:
+            delivery.material_key = normalize_material_key(delivery.material_name)
+
     @api.depends('quantity', 'unit_price')
     def _compute_total_cost(self):
         for delivery in self:
@@ -141,6 +213,62 @@ class MaterialDelivery(models.Model):
             project_name = delivery.project_id.name if delivery.project_id else 'No Project'
             delivery.display_name = f"{delivery.material_name} ({delivery.quantity} {delivery.unit}) - {project_name}"
 
+    # Cost summary dimensions -> delivery fields
+    _SUMMARY_GROUPBY = {
+        'project': 'project_id',
+        'category': 'category_id',
+        'supplier': 'supplier_name',
+    }
+    _SUMMARY_PERIODS = ('day', 'week', 'month')
+
+    @api.model
+    def get_cost_summary(self, domain=None, groupby=('project', 'category'), period=None):
+        """Delivery cost totals grouped in PostgreSQL.
+
+        ``groupby`` takes any of ``project``, ``category`` and ``supplier``;
+        ``period`` (``day``, ``week`` or ``month``) adds a delivery date
+        bucket. Returns one dict per group with the group keys plus
+        ``deliveries``, ``quantity``, ``cost``, ``average_cost`` (per
+        delivery) and ``average_unit_price``.
+        """
+        groupby = list(groupby or [])
+        group_fields = [self._SUMMARY_GROUPBY[name] for name in groupby]
+        if period:
+            if period not in self._SUMMARY_PERIODS:
+                raise ValueError(f"Unsupported period: {period}")
+            groupby.append('period')
+            group_fields.append(f'delivery_date:{period}')
+
+        groups = self._read_group(
+            domain or [],
+            group_fields,
+            ['__count', 'quantity:sum', 'total_cost:sum', 'unit_price:avg'],
+            order=', '.join(group_fields) or None,
+        )
+
+        summary = []
+        for group in groups:
+            keys = group[:len(groupby)]
+            count, quantity, cost, average_unit_price = group[len(groupby):]
+            row = {}
+            for name, value in zip(groupby, keys):
+                if name == 'period':
+                    row['period'] = fields.Date.to_string(value) if value else ''
+                elif name == 'supplier':
+                    row['supplier'] = value or ''
+                else:
+                    row[f'{name}_id'] = value.id
+                    row[name] = value.display_name or ''
+            row.update({
+                'deliveries': count,
+                'quantity': quantity,
+                'cost': cost,
+                'average_cost': cost / count if count else 0,
+                'average_unit_price': average_unit_price or 0,
+            })
+            summary.append(row)
+        return summary
+
     def action_mark_delivered(self):
         """Mark delivery as completed"""
         self.state = 'delivered'
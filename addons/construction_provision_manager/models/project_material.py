@@ -2,12 +2,16 @@
 
 from odoo import models, fields, api
 
+from .material_delivery import normalize_material_key
+
 
 class ProjectMaterial(models.Model):
     _name = 'construction.project.material'
     _description = 'Project Material Inventory'
     _order = 'project_id, category_id, material_name'
 
+    _LAST_SYNC_PARAM = 'construction_provision_manager.project_materials_last_sync'
+
     project_id = fields.Many2one(
         'project.project',
         string='Project',
@@ -19,6 +23,13 @@ class ProjectMaterial(models.Model):
         required=True,
         help='Name of the material'
     )
+    material_key = fields.Char(
+        string='Material Key',
+        compute='_compute_material_key',
+        store=True,
+        index=True,
+        help='Normalized material name matching delivery material keys'
+    )
     category_id = fields.Many2one(
         'construction.material.category',
         string='Category',
@@ -26,43 +37,37 @@ class ProjectMaterial(models.Model):
         help='Material category'
     )
 
-    # Inventory Summary
+    # Inventory Summary (maintained from deliveries, see _refresh_inventory)
     total_delivered = fields.Float(
         string='Total Delivered',
-        compute='_compute_inventory_summary',
-        store=True,
+        readonly=True,
         help='Total quantity delivered to project'
     )
     total_consumed = fields.Float(
         string='Total Consumed',
-        compute='_compute_inventory_summary',
-        store=True,
+        readonly=True,
         help='Total quantity consumed in project'
     )
     current_stock = fields.Float(
         string='Current Stock',
-        compute='_compute_inventory_summary',
-        store=True,
+        readonly=True,
         help='Current available quantity'
     )
     total_cost = fields.Float(
         string='Total Cost',
-        compute='_compute_inventory_summary',
-        store=True,
+        readonly=True,
         help='Total cost of all deliveries'
     )
 
     # Last Activity
     last_delivery_date = fields.Datetime(
         string='Last Delivery',
-        compute='_compute_inventory_summary',
-        store=True,
+        readonly=True,
         help='Date of last delivery'
     )
     last_consumption_date = fields.Datetime(
         string='Last Consumption',
-        compute='_compute_inventory_summary',
-        store=True,
+        readonly=True,
         help='Date of last consumption'
     )
 
@@ -78,42 +83,80 @@ class ProjectMaterial(models.Model):
     delivery_ids = fields.One2many(
         'construction.material.delivery',
         string='Deliveries',
-        compute='_compute_deliveries'
+        compute='_compute_delivery_ids'
     )
     delivery_count = fields.Integer(
         string='Delivery Count',
-        compute='_compute_deliveries',
-        store=True
+        readonly=True
     )
 
-    @api.depends('project_id', 'material_name')
-    def _compute_deliveries(self):
+    @api.depends('material_name')
+    def _compute_material_key(self):
         for material in self:
-            deliveries = self.env['construction.material.delivery'].search([
-                ('project_id', '=', material.project_id.id),
-                ('material_name', '=', material.material_name)
-            ])
-            material.delivery_ids = deliveries
-            material.delivery_count = len(deliveries)
-
-    @api.depends('delivery_ids.quantity', 'delivery_ids.consumed_quantity', 'delivery_ids.total_cost')
-    def _compute_inventory_summary(self):
+            material.material_key = normalize_material_key(material.material_name)
+
+    @api.depends('project_id', 'material_key')
+    def _compute_delivery_ids(self):
+        deliveries = self.env['construction.material.delivery'].search([
+            ('project_id', 'in', self.project_id.ids),
+            ('material_key', 'in', list(set(self.mapped('material_key')))),
+        ])
         for material in self:
-            deliveries = material.delivery_ids
-
-            material.total_delivered = sum(deliveries.mapped('quantity'))
-            material.total_consumed = sum(deliveries.mapped('consumed_quantity'))
-            material.current_stock = material.total_delivered - material.total_consumed
-            material.total_cost = sum(deliveries.mapped('total_cost'))
-
-            # Last activity dates
-            if deliveries:
-                material.last_delivery_date = max(deliveries.mapped('delivery_date'))
-                # Last consumption would need consumption tracking
-                material.last_consumption_date = False
-            else:
-                material.last_delivery_date = False
-                material.last_consumption_date = False
+            material.delivery_ids = deliveries.filtered(
+                lambda d: d.project_id == material.project_id and d.material_key == material.material_key
+            )
+
+    @api.model
+    def _refresh_inventory(self, keys=None):
+        """Recompute stored totals for (project_id, material_key) keys.
+
+        With ``keys=None`` every inventory line is rebuilt. Either way the
+        delivery totals come from one grouped query.
+        """
+        if keys is not None:
+            keys = {key for key in keys if key[0] and key[1]}
+            if not keys:
+                return
+            domain = [
+                ('project_id', 'in', list({key[0] for key in keys})),
+                ('material_key', 'in', list({key[1] for key in keys})),
+            ]
+        else:
+            domain = []
+
+        groups = self.env['construction.material.delivery']._read_group(
+            domain,
+            ['project_id', 'material_key'],
+            ['__count', 'quantity:sum', 'consumed_quantity:sum', 'total_cost:sum',
+             'delivery_date:max', 'last_consumption_date:max'],
+        )
+        totals = {
+            (project.id, material_key): values
+            for project, material_key, *values in groups
+        }
+
+        for material in self.search(domain):
+            key = (material.project_id.id, material.material_key)
+            if keys is not None and key not in keys:
+                continue
+            count, delivered, consumed, cost, last_delivery, last_consumption = totals.get(
+                key, (0, 0.0, 0.0, 0.0, False, False)
+            )
+            material.write({
+                'delivery_count': count,
+                'total_delivered': delivered,
+                'total_consumed': consumed,
+                'current_stock': delivered - consumed,
+                'total_cost': cost,
+                'last_delivery_date': last_delivery,
+                'last_consumption_date': last_consumption,
+            })
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        materials = super().create(vals_list)
+        self._refresh_inventory({(m.project_id.id, m.material_key) for m in materials})
+        return materials
 
     @api.depends('current_stock')
     def _compute_status(self):
@@ -134,7 +177,7 @@ class ProjectMaterial(models.Model):
             'view_mode': 'tree,form',
             'domain': [
                 ('project_id', '=', self.project_id.id),
-                ('material_name', '=', self.material_name)
+                ('material_key', '=', self.material_key)
             ],
             'context': {
                 'default_project_id': self.project_id.id,
@@ -159,30 +202,50 @@ class ProjectMaterial(models.Model):
         }
 
     @api.model
-    def update_project_materials(self):
-        """Update project material summary from deliveries"""
-        # This method will be called to refresh the material inventory
-        # when new deliveries are added
-        deliveries = self.env['construction.material.delivery'].search([])
-
-        # Group by project and material
-        project_materials = {}
-        for delivery in deliveries:
-            key = (delivery.project_id.id, delivery.material_name, delivery.category_id.id)
-            if key not in project_materials:
-                project_materials[key] = {
-                    'project_id': delivery.project_id.id,
-                    'material_name': delivery.material_name,
-                    'category_id': delivery.category_id.id,
-                }
-
-        # Create or update project material records
-        for key, values in project_materials.items():
-            existing = self.search([
-                ('project_id', '=', values['project_id']),
-                ('material_name', '=', values['material_name']),
-                ('category_id', '=', values['category_id']),
-            ])
-
-            if not existing:
-                self.create(values)
\ No newline at end of file
+    def update_project_materials(self, incremental=False, project_ids=None):
+        """Create missing inventory lines from deliveries.
+
+        Distinct (project, material, category) keys come from one grouped
+        query, are diffed in memory against existing lines and the missing
+        ones are created in a single batch. ``project_ids`` restricts the
+        rebuild; ``incremental=True`` restricts it to projects with
+        deliveries changed since the previous run.
+        """
+        Delivery = self.env['construction.material.delivery']
+        params = self.env['ir.config_parameter'].sudo()
+        run_started = fields.Datetime.now()
+
+        domain = []
+        if project_ids is not None:
+            domain.append(('project_id', 'in', project_ids))
+        if incremental:
+            last_run = params.get_param(self._LAST_SYNC_PARAM)
+            if last_run:
+                touched = Delivery._read_group(
+                    domain + [('write_date', '>=', last_run)], ['project_id'],
+                )
+                domain = [('project_id', 'in', [project.id for project, in touched])]
+
+        groups = Delivery._read_group(
+            domain,
+            ['project_id', 'material_key', 'category_id'],
+            ['material_name:min'],
+        )
+        existing = {
+            (line['project_id'][0], line['material_key'], line['category_id'][0])
+            for line in self.search_read(domain, ['project_id', 'material_key', 'category_id'])
+            if line['project_id'] and line['category_id']
+        }
+
+        vals_list = [{
+            'project_id': project.id,
+            'material_name': material_name,
+            'category_id': category.id,
+        } for project, material_key, category, material_name in groups
+            if project and category and material_key
+            and (project.id, material_key, category.id) not in existing]
+        created = self.create(vals_list)
+
+        if project_ids is None:
+            params.set_param(self._LAST_SYNC_PARAM, fields.Datetime.to_string(run_started))
+        return created
@@ -57,7 +57,10 @@ class MaterialConsumptionWizard(models.TransientModel):
         """Record material consumption"""
         for wizard in self:
             # Update delivery consumed quantity
-            wizard.delivery_id.consumed_quantity += wizard.consume_quantity
+            wizard.delivery_id.write({
+                'consumed_quantity': wizard.delivery_id.consumed_quantity + wizard.consume_quantity,
+                'last_consumption_date': wizard.consumption_date,
+            })
 
             # Update delivery state if fully consumed
             if wizard.delivery_id.remaining_quantity <= 0:
@@ -84,6 +87,8 @@ class MaterialConsumptionWizard(models.TransientModel):
             wizard.delivery_id.delivery_notes = current_notes + consumption_note
 
             # Trigger project material inventory update
-            self.env['construction.project.material'].update_project_materials()
+            self.env['construction.project.material'].update_project_materials(
+                project_ids=wizard.delivery_id.project_id.ids
+            )
 
         return {'type': 'ir.actions.act_window_close'}
\ No newline at end of file
@@ -1,10 +1,17 @@
 # -*- coding: utf-8 -*-
 
-import base64
-import io
+import csv
+import hashlib
+import os
+import shutil
+import tempfile
 from datetime import datetime, timedelta
 from odoo import models, fields, api
-from odoo.tools import pycompat
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
 
 
 class MaterialExportWizard(models.TransientModel):
@@ -48,7 +55,18 @@ class MaterialExportWizard(models.TransientModel):
         ('xlsx', 'Excel'),
     ], string='File Format', required=True, default='csv')
 
-    export_file = fields.Binary(
+    summary_period = fields.Selection([
+        ('day', 'Day'),
+        ('week', 'Week'),
+        ('month', 'Month'),
+    ], string='Group by Period', help='Split the cost summary by delivery period')
+    summary_by_supplier = fields.Boolean(
+        string='Group by Supplier',
+        help='Split the cost summary by supplier'
+    )
+
+    export_attachment_id = fields.Many2one(
+        'ir.attachment',
         string='Export File',
         readonly=True
     )
@@ -57,27 +75,63 @@ class MaterialExportWizard(models.TransientModel):
         readonly=True
     )
 
+    # Records read per chunk while streaming an export
+    _EXPORT_CHUNK_SIZE = 2000
+
+    _DELIVERY_EXPORT_FIELDS = [
+        ('Project', 'project_id'),
+        ('Material', 'material_name'),
+        ('Category', 'category_id'),
+        ('Quantity', 'quantity'),
+        ('Unit', 'unit'),
+        ('Unit Price', 'unit_price'),
+        ('Total Cost', 'total_cost'),
+        ('Supplier', 'supplier_name'),
+        ('Delivery Date', 'delivery_date'),
+        ('Status', 'state'),
+        ('Consumed', 'consumed_quantity'),
+        ('Remaining', 'remaining_quantity'),
+        ('Received By', 'received_by'),
+    ]
+
     def action_export(self):
-        """Generate and download export file"""
+        """Generate the export file and attach it for download.
+
+        Rows are produced chunk by chunk and written straight to a temporary
+        file, so memory use does not grow with the number of records.
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
         if self.export_type == 'deliveries':
-            data = self._get_deliveries_data()
-            filename = f"material_deliveries_{datetime.now().strftime('%Y%m%d_%H%M')}"
+            rows = self._iter_deliveries_rows()
+            filename = f"material_deliveries_{timestamp}"
         elif self.export_type == 'inventory':
-            data = self._get_inventory_data()
-            filename = f"project_inventory_{datetime.now().strftime('%Y%m%d_%H%M')}"
+            rows = self._iter_rows(self._get_inventory_data())
+            filename = f"project_inventory_{timestamp}"
         else:  # summary
-            data = self._get_summary_data()
-            filename = f"cost_summary_{datetime.now().strftime('%Y%m%d_%H%M')}"
+            rows = self._iter_rows(self._get_summary_data())
+            filename = f"cost_summary_{timestamp}"
 
-        if self.file_format == 'csv':
-            file_content = self._generate_csv(data)
-            filename += '.csv'
-        else:
-            file_content = self._generate_xlsx(data)
-            filename += '.xlsx'
+        # Fallback to CSV if xlsxwriter not available
+        file_format = self.file_format if xlsxwriter else 'csv'
+        filename += f'.{file_format}'
 
-        self.export_file = base64.b64encode(file_content)
-        self.export_filename = filename
+        fd, path = tempfile.mkstemp(suffix=f'.{file_format}')
+        os.close(fd)
+        try:
+            if file_format == 'csv':
+                self._write_csv(rows, path)
+                mimetype = 'text/csv'
+            else:
+                self._write_xlsx(rows, path)
+                mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            attachment = self._store_export_file(path, filename, mimetype)
+        finally:
+            os.unlink(path)
+
+        self.write({
+            'export_attachment_id': attachment.id,
+            'export_filename': filename,
+        })
 
         return {
             'type': 'ir.actions.act_window',
@@ -88,8 +142,7 @@ class MaterialExportWizard(models.TransientModel):
             'context': {'show_download': True}
         }
 
-    def _get_deliveries_data(self):
-        """Get material deliveries data"""
+    def _get_delivery_domain(self):
         domain = [
             ('delivery_date', '>=', self.date_from),
             ('delivery_date', '<=', self.date_to),
@@ -99,28 +152,133 @@ class MaterialExportWizard(models.TransientModel):
             domain.append(('project_id', 'in', self.project_ids.ids))
         if self.category_ids:
             domain.append(('category_id', 'in', self.category_ids.ids))
+        return domain
+
+    def _iter_deliveries_rows(self):
+        """Yield the header, then delivery rows read in id-ordered chunks"""
+        headers = [header for header, field_name in self._DELIVERY_EXPORT_FIELDS]
+        field_names = [field_name for header, field_name in self._DELIVERY_EXPORT_FIELDS]
+        yield headers
+
+        Delivery = self.env['construction.material.delivery']
+        domain = self._get_delivery_domain()
+        last_id = 0
+        while True:
+            deliveries = Delivery.search(domain + [('id', '>', last_id)], order='id', limit=self._EXPORT_CHUNK_SIZE)
+            if not deliveries:
+                break
+            last_id = deliveries[-1].id
+            for values in deliveries.read(field_names):
+                yield [self._format_export_value(values[field_name]) for field_name in field_names]
+            # Drop the chunk from the cache so memory stays flat
+            self.env.invalidate_all()
+
+    @api.model
+    def _format_export_value(self, value):
+        if isinstance(value, tuple):  # many2one (id, name)
+            return value[1]
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d %H:%M')
+        if value is False or value is None:
+            return ''
+        return value
+
+    @api.model
+    def _iter_rows(self, data):
+        """Yield header and rows from a list of dicts"""
+        if not data:
+            yield ['No data to export']
+            return
+        headers = list(data[0].keys())
+        yield headers
+        for row in data:
+            yield [row.get(header, '') for header in headers]
 
-        deliveries = self.env['construction.material.delivery'].search(domain)
+    def _write_csv(self, rows, path):
+        """Write rows through csv.writer (quotes values containing commas)"""
+        with open(path, 'w', encoding='utf-8', newline='') as output:
+            csv.writer(output).writerows(rows)
 
-        data = []
-        for delivery in deliveries:
-            data.append({
-                'Project': delivery.project_id.name,
-                'Material': delivery.material_name,
-                'Category': delivery.category_id.name,
-                'Quantity': delivery.quantity,
-                'Unit': delivery.unit,
-                'Unit Price': delivery.unit_price,
-                'Total Cost': delivery.total_cost,
-                'Supplier': delivery.supplier_name or '',
-                'Delivery Date': delivery.delivery_date.strftime('%Y-%m-%d %H:%M'),
-                'Status': delivery.state,
-                'Consumed': delivery.consumed_quantity,
-                'Remaining': delivery.remaining_quantity,
-                'Received By': delivery.received_by.name,
-            })
+    def _write_xlsx(self, rows, path):
+        """Write rows with xlsxwriter in constant_memory mode (row by row)"""
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        worksheet = workbook.add_worksheet('Materials Export')
 
-        return data
+        # Header format
+        header_format = workbook.add_format({
+            'bold': True,
+            'bg_color': '#0064FF',
+            'font_color': 'white',
+            'border': 1
+        })
+
+        # Data format
+        data_format = workbook.add_format({'border': 1})
+        currency_format = workbook.add_format({'num_format': '$#,##0.00', 'border': 1})
+
+        # Write headers
+        headers = next(rows)
+        currency_columns = {
+            col for col, header in enumerate(headers)
+            if 'cost' in header.lower() or 'price' in header.lower()
+        }
+        for col, header in enumerate(headers):
+            worksheet.write(0, col, header, header_format)
+            # Auto-adjust column widths
+            worksheet.set_column(col, col, len(header) + 5)
+
+        # Write data
+        for row_num, row_data in enumerate(rows, 1):
+            for col, value in enumerate(row_data):
+                # Format currency columns
+                if col in currency_columns:
+                    worksheet.write(row_num, col, float(value) if value else 0, currency_format)
+                else:
+                    worksheet.write(row_num, col, value, data_format)
+
+        workbook.close()
+
+    # Chunk size used to hash and copy export files
+    _EXPORT_COPY_CHUNK = 1024 * 1024
+
+    def _store_export_file(self, path, filename, mimetype):
+        """Attach the export file, copying it into the filestore in chunks.
+
+        Memory stays flat whatever the export size: the file is hashed and
+        copied chunk by chunk and the attachment is created on the stored
+        file, without content indexing. The stored file is marked for the
+        filestore garbage collector, so a rolled back export leaves nothing.
+        """
+        Attachment = self.env['ir.attachment']
+        values = {
+            'name': filename,
+            'mimetype': mimetype,
+            'res_model': self._name,
+            'res_id': self.id,
+            'index_content': False,
+        }
+        if Attachment._storage() != 'file':
+            with open(path, 'rb') as export_file:
+                return Attachment.create(dict(values, raw=export_file.read()))
+
+        sha = hashlib.sha1()
+        with open(path, 'rb') as export_file:
+            for chunk in iter(lambda: export_file.read(self._EXPORT_COPY_CHUNK), b''):
+                sha.update(chunk)
+        checksum = sha.hexdigest()
+        store_fname = f'{checksum[:2]}/{checksum}'
+        full_path = Attachment._full_path(store_fname)
+        if not os.path.exists(full_path):
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(path, 'rb') as export_file, open(full_path, 'wb') as stored_file:
+                shutil.copyfileobj(export_file, stored_file, self._EXPORT_COPY_CHUNK)
+        Attachment._mark_for_gc(store_fname)
+        return Attachment.sudo().create(dict(
+            values,
+            store_fname=store_fname,
+            checksum=checksum,
+            file_size=os.path.getsize(path),
+        ))
 
     def _get_inventory_data(self):
         """Get project inventory data"""
@@ -152,132 +310,40 @@ class MaterialExportWizard(models.TransientModel):
 
     def _get_summary_data(self):
         """Get cost summary by project"""
-        domain = [
-            ('delivery_date', '>=', self.date_from),
-            ('delivery_date', '<=', self.date_to),
-        ]
-
-        if self.project_ids:
-            domain.append(('project_id', 'in', self.project_ids.ids))
-        if self.category_ids:
-            domain.append(('category_id', 'in', self.category_ids.ids))
+        groupby = ['project', 'category']
+        if self.summary_by_supplier:
+            groupby.append('supplier')
+        summary = self.env['construction.material.delivery'].get_cost_summary(
+            self._get_delivery_domain(),
+            groupby=groupby,
+            period=self.summary_period or None,
+        )
 
-        deliveries = self.env['construction.material.delivery'].search(domain)
-
-        # Group by project and category
-        summary = {}
-        for delivery in deliveries:
-            project_name = delivery.project_id.name
-            category_name = delivery.category_id.name
-
-            if project_name not in summary:
-                summary[project_name] = {}
-
-            if category_name not in summary[project_name]:
-                summary[project_name][category_name] = {
-                    'quantity': 0,
-                    'cost': 0,
-                    'deliveries': 0
-                }
-
-            summary[project_name][category_name]['quantity'] += delivery.quantity
-            summary[project_name][category_name]['cost'] += delivery.total_cost
-            summary[project_name][category_name]['deliveries'] += 1
-
-        # Convert to flat data structure
         data = []
-        for project, categories in summary.items():
-            for category, values in categories.items():
-                data.append({
-                    'Project': project,
-                    'Category': category,
-                    'Total Deliveries': values['deliveries'],
-                    'Total Quantity': values['quantity'],
-                    'Total Cost': values['cost'],
-                    'Average Cost per Delivery': values['cost'] / values['deliveries'] if values['deliveries'] > 0 else 0,
-                })
+        for values in summary:
+            row = {}
+            if 'period' in values:
+                row['Period'] = values['period']
+            row.update({
+                'Project': values['project'],
+                'Category': values['category'],
+            })
+            if 'supplier' in values:
+                row['Supplier'] = values['supplier']
+            row.update({
+                'Total Deliveries': values['deliveries'],
+                'Total Quantity': values['quantity'],
+                'Total Cost': values['cost'],
+                'Average Cost per Delivery': values['average_cost'],
+            })
+            data.append(row)
 
         return data
 
-    def _generate_csv(self, data):
-        """Generate CSV file content"""
-        if not data:
-            return b"No data to export"
-
-        output = io.StringIO()
-
-        # Write header
-        headers = list(data[0].keys())
-        output.write(','.join(headers) + '\n')
-
-        # Write data rows
-        for row in data:
-            values = [str(row.get(header, '')) for header in headers]
-            output.write(','.join(values) + '\n')
-
-        content = output.getvalue()
-        output.close()
-
-        return content.encode('utf-8')
-
-    def _generate_xlsx(self, data):
-        """Generate Excel file content"""
-        try:
-            import xlsxwriter
-        except ImportError:
-            # Fallback to CSV if xlsxwriter not available
-            return self._generate_csv(data)
-
-        if not data:
-            return b"No data to export"
-
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-        worksheet = workbook.add_worksheet('Materials Export')
-
-        # Header format
-        header_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#0064FF',
-            'font_color': 'white',
-            'border': 1
-        })
-
-        # Data format
-        data_format = workbook.add_format({'border': 1})
-        currency_format = workbook.add_format({'num_format': '$#,##0.00', 'border': 1})
-
-        # Write headers
-        headers = list(data[0].keys())
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header, header_format)
-
-        # Write data
-        for row_num, row_data in enumerate(data, 1):
-            for col, header in enumerate(headers):
-                value = row_data.get(header, '')
-
-                # Format currency columns
-                if 'cost' in header.lower() or 'price' in header.lower():
-                    worksheet.write(row_num, col, float(value) if value else 0, currency_format)
-                else:
-                    worksheet.write(row_num, col, value, data_format)
-
-        # Auto-adjust column widths
-        for col, header in enumerate(headers):
-            worksheet.set_column(col, col, len(header) + 5)
-
-        workbook.close()
-        output.seek(0)
-        content = output.read()
-        output.close()
-
-        return content
-
     def action_download(self):
         """Download the exported file"""
         return {
             'type': 'ir.actions.act_url',
-            'url': f'/web/content?model={self._name}&id={self.id}&field=export_file&download=true&filename={self.export_filename}',
+            'url': f'/web/content/{self.export_attachment_id.id}?download=true',
             'target': 'self',
         }
\ No newline at end of file
@@ -42,23 +42,11 @@ class ProjectBudgetLine(models.Model):
         for line in self:
             line.has_linked_task = bool(line.task_id)
 
-    @api.depends('task_id.stage_id')
+    @api.depends('task_id.stage_id.progress_weight')
     def _compute_task_progress(self):
-        """Compute task progress based on stage"""
+        """Compute task progress from the progress weight of its stage"""
         for line in self:
-            if line.task_id and line.task_id.stage_id:
-                # Simple progress mapping based on stage
-                stage_name = line.task_id.stage_id.name.lower()
-                if 'done' in stage_name or 'complete' in stage_name or 'finish' in stage_name:
-                    line.task_progress = 100.0
-                elif 'progress' in stage_name or 'doing' in stage_name or 'working' in stage_name:
-                    line.task_progress = 50.0
-                elif 'review' in stage_name or 'test' in stage_name:
-                    line.task_progress = 75.0
-                else:
-                    line.task_progress = 0.0
-            else:
-                line.task_progress = 0.0
+            line.task_progress = line.task_id.stage_id.progress_weight if line.task_id else 0.0
 
     @api.depends('task_id.user_ids')
     def _compute_task_assignee(self):
@@ -46,6 +46,8 @@ flowing through project warehouses from suppliers to consumption.
         'security/warehouse_security.xml',
         'security/ir.model.access.csv',
         'data/warehouse_data.xml',
+        'data/stock_journal_data.xml',
+        'data/reorder_data.xml',
         'views/construction_material_views.xml',
         'views/project_warehouse_views.xml',
         'views/warehouse_stock_views.xml',
@@ -53,6 +55,8 @@ flowing through project warehouses from suppliers to consumption.
         'views/material_consumption_views.xml',
         'views/quick_task_wizard_views.xml',
         'views/supplier_portal_views.xml',
+        'views/stock_journal_views.xml',
+        'views/project_task_views.xml',
         'views/warehouse_menus.xml',
     ],
     'demo': [
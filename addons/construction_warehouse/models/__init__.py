@@ -5,4 +5,6 @@ from . import warehouse_stock
 from . import material_receipt
 from . import material_consumption
 from . import construction_material
-from . import quick_task_wizard
\ No newline at end of file
+from . import quick_task_wizard
+from . import stock_journal
+from . import project_task
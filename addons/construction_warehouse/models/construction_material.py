@@ -138,10 +138,22 @@ class ConstructionMaterial(models.Model):
 
     @api.depends('stock_ids.quantity', 'stock_ids.total_value')
     def _compute_stock_info(self):
+        # One grouped query for the whole catalog page; empty lines add
+        # nothing to the sums and must not count as a storing warehouse
+        groups = self.env['construction.warehouse.stock']._read_group(
+            [('material_id', 'in', self._origin.ids), ('quantity', '!=', 0)],
+            ['material_id'],
+            ['quantity:sum', 'total_value:sum', 'warehouse_id:count_distinct'],
+        )
+        totals = {
+            material.id: (quantity, value, warehouse_count)
+            for material, quantity, value, warehouse_count in groups
+        }
         for material in self:
-            material.total_stock_quantity = sum(material.stock_ids.mapped('quantity'))
-            material.total_stock_value = sum(material.stock_ids.mapped('total_value'))
-            material.warehouse_count = len(material.stock_ids.filtered('quantity'))
+            quantity, value, warehouse_count = totals.get(material._origin.id, (0.0, 0.0, 0))
+            material.total_stock_quantity = quantity
+            material.total_stock_value = value
+            material.warehouse_count = warehouse_count
 
     def action_view_stock(self):
         """View stock across all warehouses"""
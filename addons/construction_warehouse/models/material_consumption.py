@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from markupsafe import Markup
+
+from odoo import models, fields, api, tools
 from odoo.exceptions import ValidationError
 
 
@@ -120,13 +122,13 @@ class MaterialConsumption(models.Model):
     # Costing (from warehouse stock)
     unit_cost = fields.Float(
         string='Unit Cost',
-        compute='_compute_cost_info',
+        compute='_compute_unit_cost',
         store=True,
-        help='Unit cost from warehouse stock'
+        help='Unit cost from warehouse stock, frozen when the consumption is confirmed'
     )
     total_cost = fields.Float(
         string='Total Cost',
-        compute='_compute_cost_info',
+        compute='_compute_total_cost',
         store=True,
         help='Total cost of consumed material'
     )
@@ -138,35 +140,41 @@ class MaterialConsumption(models.Model):
         store=True
     )
 
+    def init(self):
+        # Activity summaries read per-warehouse date ranges
+        tools.create_index(
+            self._cr, 'construction_material_consumption_warehouse_date_index',
+            self._table, ['warehouse_id', 'consumption_date'],
+        )
+
+    def _get_stock_by_key(self):
+        """Stock rows for every (warehouse, material) pair in self with one search"""
+        stocks = self.env['construction.warehouse.stock'].search([
+            ('warehouse_id', 'in', self.warehouse_id.ids),
+            ('material_id', 'in', self.material_id.ids),
+        ])
+        return {(stock.warehouse_id.id, stock.material_id.id): stock for stock in stocks}
+
     @api.depends('warehouse_id', 'material_id')
     def _compute_available_quantity(self):
+        stocks = self._get_stock_by_key()
         for consumption in self:
-            if consumption.warehouse_id and consumption.material_id:
-                stock = self.env['construction.warehouse.stock'].search([
-                    ('warehouse_id', '=', consumption.warehouse_id.id),
-                    ('material_id', '=', consumption.material_id.id)
-                ], limit=1)
-                consumption.available_quantity = stock.available_quantity if stock else 0
-            else:
-                consumption.available_quantity = 0
-
-    @api.depends('warehouse_id', 'material_id', 'quantity')
-    def _compute_cost_info(self):
+            stock = stocks.get((consumption.warehouse_id.id, consumption.material_id.id))
+            consumption.available_quantity = stock.available_quantity if stock else 0
+
+    @api.depends('warehouse_id', 'material_id')
+    def _compute_unit_cost(self):
+        # Quantity edits only rescale total_cost; confirmation overwrites
+        # unit_cost with the stock cost at that moment (see _confirm_and_update_stock)
+        stocks = self._get_stock_by_key()
+        for consumption in self:
+            stock = stocks.get((consumption.warehouse_id.id, consumption.material_id.id))
+            consumption.unit_cost = stock.unit_cost if stock else 0
+
+    @api.depends('quantity', 'unit_cost')
+    def _compute_total_cost(self):
         for consumption in self:
-            if consumption.warehouse_id and consumption.material_id:
-                stock = self.env['construction.warehouse.stock'].search([
-                    ('warehouse_id', '=', consumption.warehouse_id.id),
-                    ('material_id', '=', consumption.material_id.id)
-                ], limit=1)
-                if stock:
-                    consumption.unit_cost = stock.unit_cost
-                    consumption.total_cost = consumption.quantity * consumption.unit_cost
-                else:
-                    consumption.unit_cost = 0
-                    consumption.total_cost = 0
-            else:
-                consumption.unit_cost = 0
-                consumption.total_cost = 0
+            consumption.total_cost = consumption.quantity * consumption.unit_cost
 
     @api.depends('material_id', 'quantity', 'consumed_by_id', 'consumption_date')
     def _compute_display_name(self):
@@ -201,41 +209,51 @@ class MaterialConsumption(models.Model):
                     "Select a task from the dropdown or create a new task if work was not in original смета."
                 )
 
+    @api.model
+    def _get_task_consumed_costs(self, task_ids):
+        """Confirmed material cost per task with one grouped query"""
+        if not task_ids:
+            return {}
+        groups = self._read_group(
+            [('task_id', 'in', task_ids),
+             ('consumption_status', 'in', ['confirmed', 'completed'])],
+            ['task_id'],
+            ['total_cost:sum'],
+        )
+        return {task.id: total_cost for task, total_cost in groups}
+
     @api.constrains('task_id', 'total_cost', 'material_id')
     def _check_task_budget_allocation(self):
         """Warn if consumption exceeds task budget allocation"""
+        tasks = self.task_id
+        # Check if task has budget allocation
+        if 'budget_allocation' not in tasks._fields:
+            return
+        tasks = tasks.filtered('budget_allocation')
+        # Calculate total consumed per task in one query for the whole batch
+        consumed = self._get_task_consumed_costs(tasks.ids)
+
         for consumption in self:
-            if consumption.task_id and consumption.total_cost > 0:
-                # Check if task has budget allocation
-                task = consumption.task_id
-                if hasattr(task, 'budget_allocation') and task.budget_allocation:
-                    # Calculate total consumed for this task
-                    total_consumed = self.search([
-                        ('task_id', '=', task.id),
-                        ('consumption_status', 'in', ['confirmed', 'completed']),
-                        ('id', '!=', consumption.id)  # Exclude current record
-                    ])
-                    total_spent = sum(total_consumed.mapped('total_cost')) + consumption.total_cost
-
-                    if total_spent > task.budget_allocation * 1.1:  # 10% tolerance
-                        raise ValidationError(
-                            f"Budget Warning: Material consumption ({total_spent:.2f}) exceeds "
-                            f"task budget allocation ({task.budget_allocation:.2f}) by more than 10%. "
-                            f"Task: {task.name}"
-                        )
+            task = consumption.task_id
+            if task in tasks and consumption.total_cost > 0:
+                total_spent = consumed.get(task.id, 0.0)
+                if consumption.consumption_status not in ('confirmed', 'completed'):
+                    # Not part of the aggregate yet
+                    total_spent += consumption.total_cost
+
+                if total_spent > task.budget_allocation * 1.1:  # 10% tolerance
+                    raise ValidationError(
+                        f"Budget Warning: Material consumption ({total_spent:.2f}) exceeds "
+                        f"task budget allocation ({task.budget_allocation:.2f}) by more than 10%. "
+                        f"Task: {task.name}"
+                    )
 
     @api.onchange('warehouse_id', 'material_id')
     def _onchange_warehouse_material(self):
         """Update available quantity when warehouse or material changes"""
         if self.warehouse_id and self.material_id:
-            stock = self.env['construction.warehouse.stock'].search([
-                ('warehouse_id', '=', self.warehouse_id.id),
-                ('material_id', '=', self.material_id.id)
-            ], limit=1)
-            if stock:
-                self.available_quantity = stock.available_quantity
-            else:
-                self.available_quantity = 0
+            stock = self._get_stock_by_key().get((self.warehouse_id.id, self.material_id.id))
+            self.available_quantity = stock.available_quantity if stock else 0
 
     @api.onchange('task_id')
     def _onchange_task_selection(self):
@@ -263,26 +281,30 @@ class MaterialConsumption(models.Model):
 
     def action_confirm_consumption(self):
         """Confirm consumption and update warehouse stock"""
+        to_confirm = self.filtered(lambda c: c.consumption_status == 'draft')
+        to_confirm._confirm_and_update_stock()
+
+        # Russian Spec: Log task-centric consumption
+        for consumption in to_confirm:
+            consumption._log_russian_consumption_message()
+
+    def _confirm_and_update_stock(self):
+        # Stock rows are locked and checked atomically, so two concurrent
+        # confirmations of the same material cannot both pass
+        self.env['construction.stock.move']._post([{
+            'warehouse_id': consumption.warehouse_id.id,
+            'material_id': consumption.material_id.id,
+            'quantity': -consumption.quantity,
+            'move_type': 'consumption',
+            'consumption_id': consumption.id,
+        } for consumption in self])
+
+        # Freeze cost so later receipts at other prices don't re-cost history
+        stocks = self._get_stock_by_key()
         for consumption in self:
-            if consumption.consumption_status == 'draft':
-                # Check stock availability
-                if consumption.quantity > consumption.available_quantity:
-                    raise ValidationError(
-                        f"Cannot consume {consumption.quantity} units. "
-                        f"Only {consumption.available_quantity} units available."
-                    )
-
-                consumption.consumption_status = 'confirmed'
-
-                # Update warehouse stock
-                self.env['construction.warehouse.stock'].update_stock_from_consumption(
-                    consumption.warehouse_id.id,
-                    consumption.material_id.id,
-                    consumption.quantity
-                )
-
-                # Russian Spec: Log task-centric consumption
-                consumption._log_russian_consumption_message()
+            stock = stocks.get((consumption.warehouse_id.id, consumption.material_id.id))
+            consumption.unit_cost = stock.unit_cost if stock else 0
+        self.consumption_status = 'confirmed'
 
     def action_complete_consumption(self):
         """Mark consumption as completed"""
@@ -290,16 +312,16 @@ class MaterialConsumption(models.Model):
 
     def action_cancel_consumption(self):
         """Cancel consumption and restore stock if it was confirmed"""
-        for consumption in self:
-            if consumption.consumption_status == 'confirmed':
-                # Restore stock
-                self.env['construction.warehouse.stock'].update_stock_from_receipt(
-                    consumption.warehouse_id.id,
-                    consumption.material_id.id,
-                    consumption.quantity
-                )
-
-            consumption.consumption_status = 'cancelled'
+        confirmed = self.filtered(lambda c: c.consumption_status == 'confirmed')
+        # Restore stock
+        self.env['construction.stock.move']._post([{
+            'warehouse_id': consumption.warehouse_id.id,
+            'material_id': consumption.material_id.id,
+            'quantity': consumption.quantity,
+            'move_type': 'consumption_cancel',
+            'consumption_id': consumption.id,
+        } for consumption in confirmed])
+        self.consumption_status = 'cancelled'
 
     def action_upload_photos(self):
         """Upload usage photos"""
@@ -369,24 +391,76 @@ class MaterialConsumption(models.Model):
 
         return consumption
 
+    @api.model
+    def site_manager_consume_materials(self, lines):
+        """Bulk variant of site_manager_consume_material for end-of-day reports.
+
+        ``lines`` is a list of dicts with ``warehouse_id``, ``material_id``,
+        ``quantity``, ``task_id`` and optional ``notes`` / ``work_location``.
+        All consumptions are created at once; those covered by available
+        stock (in submission order) are confirmed with one grouped stock
+        update and the rest stay in draft, as in the single-line helper.
+        Each project gets one summary message instead of one per line.
+        """
+        if not lines:
+            return self.browse()
+
+        consumptions = self.create([{
+            'warehouse_id': line['warehouse_id'],
+            'material_id': line['material_id'],
+            'quantity': line['quantity'],
+            'task_id': line.get('task_id'),
+            'consumption_notes': line.get('notes'),
+            'work_location': line.get('work_location'),
+            'consumption_status': 'draft',
+        } for line in lines])
+
+        # One pass over stock for every (warehouse, material) in the report
+        groups = self.env['construction.warehouse.stock']._read_group(
+            [('warehouse_id', 'in', consumptions.warehouse_id.ids),
+             ('material_id', 'in', consumptions.material_id.ids)],
+            ['warehouse_id', 'material_id'],
+            ['available_quantity:sum'],
+        )
+        available = {
+            (warehouse.id, material.id): quantity
+            for warehouse, material, quantity in groups
+        }
+
+        to_confirm = self.browse()
+        for consumption in consumptions:
+            key = (consumption.warehouse_id.id, consumption.material_id.id)
+            if consumption.quantity <= available.get(key, 0.0):
+                available[key] -= consumption.quantity
+                to_confirm |= consumption
+
+        to_confirm._confirm_and_update_stock()
+        to_confirm._log_bulk_consumption_summary()
+        return consumptions
+
+    def _get_russian_consumption_message(self):
+        """Consumption line in Russian specification format"""
+        self.ensure_one()
+        # Russian format: "Прораб [Name] списал [Quantity] [Material] на задачу [Task]"
+        user_name = self.consumed_by_id.name
+        material_name = self.material_id.name
+        quantity_unit = f"{self.quantity} {self.unit_of_measure}"
+        task_name = self.task_id.name
+
+        smeta_info = ""
+        # Check if task has smeta information (might be in description or name)
+        task = self.task_id
+        if hasattr(task, 'smeta_number') and task.smeta_number:
+            smeta_info = f" (смета #{task.smeta_number})"
+        elif 'смета' in task.name.lower() or 'smeta' in task.name.lower():
+            smeta_info = " (смета задача)"
+
+        return f"Прораб {user_name} списал {quantity_unit} {material_name} на задачу «{task_name}»{smeta_info}"
+
     def _log_russian_consumption_message(self):
         """Log consumption in Russian specification format"""
         if self.task_id and self.material_id and self.consumed_by_id:
-            # Russian format: "Прораб [Name] списал [Quantity] [Material] на задачу [Task]"
-            user_name = self.consumed_by_id.name
-            material_name = self.material_id.name
-            quantity_unit = f"{self.quantity} {self.unit_of_measure}"
-            task_name = self.task_id.name
-
-            smeta_info = ""
-            # Check if task has smeta information (might be in description or name)
-            task = self.task_id
-            if hasattr(task, 'smeta_number') and task.smeta_number:
-                smeta_info = f" (смета #{task.smeta_number})"
-            elif 'смета' in task.name.lower() or 'smeta' in task.name.lower():
-                smeta_info = " (смета задача)"
-
-            message = f"Прораб {user_name} списал {quantity_unit} {material_name} на задачу «{task_name}»{smeta_info}"
+            message = self._get_russian_consumption_message()
 
             # Log to consumption record
             self.message_post(body=message)
@@ -398,6 +472,21 @@ class MaterialConsumption(models.Model):
                     subtype_xmlid='mail.mt_note'
                 )
 
+    def _log_bulk_consumption_summary(self):
+        """Post one summary note per project for a batch of consumptions"""
+        for project in self.project_id:
+            consumptions = self.filtered(
+                lambda c: c.project_id == project and c.task_id and c.material_id and c.consumed_by_id
+            )
+            if not consumptions:
+                continue
+            lines = [f"Материалы списаны: {len(consumptions)} позиций"]
+            lines += [consumption._get_russian_consumption_message() for consumption in consumptions]
+            project.message_post(
+                body=Markup('<br/>').join(lines),
+                subtype_xmlid='mail.mt_note'
+            )
+
     def action_create_new_task(self):
         """Quick action to create new task for material consumption"""
         if not self.project_id:
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.exceptions import ValidationError
 
 
@@ -160,6 +160,13 @@ class MaterialReceipt(models.Model):
         store=True
     )
 
+    def init(self):
+        # Activity summaries read per-warehouse date ranges
+        tools.create_index(
+            self._cr, 'construction_material_receipt_warehouse_date_index',
+            self._table, ['warehouse_id', 'receipt_date'],
+        )
+
     @api.depends('quantity', 'unit_cost')
     def _compute_total_cost(self):
         for receipt in self:
@@ -185,18 +192,21 @@ class MaterialReceipt(models.Model):
 
     def action_mark_received(self):
         """Mark receipt as received and update warehouse stock"""
-        for receipt in self:
-            if receipt.receipt_status == 'draft':
-                receipt.receipt_status = 'received'
+        to_receive = self.filtered(lambda r: r.receipt_status == 'draft')
+        to_receive.receipt_status = 'received'
+
+        # Update warehouse stock
+        self.env['construction.stock.move']._post([{
+            'warehouse_id': receipt.warehouse_id.id,
+            'material_id': receipt.material_id.id,
+            'quantity': receipt._get_acceptable_quantity(),
+            'move_type': 'receipt',
+            'receipt_id': receipt.id,
+        } for receipt in to_receive])
 
-                # Update warehouse stock
-                acceptable_quantity = receipt.quantity - receipt.damaged_quantity
-                if acceptable_quantity > 0:
-                    self.env['construction.warehouse.stock'].update_stock_from_receipt(
-                        receipt.warehouse_id.id,
-                        receipt.material_id.id,
-                        acceptable_quantity
-                    )
+    def _get_acceptable_quantity(self):
+        self.ensure_one()
+        return max(self.quantity - self.damaged_quantity, 0.0)
 
     def action_quality_check(self):
         """Perform quality check"""
@@ -218,18 +228,21 @@ class MaterialReceipt(models.Model):
 
     def action_reject_material(self):
         """Reject material - reverse stock update"""
-        for receipt in self:
-            receipt.receipt_status = 'rejected'
-            receipt.quality_check = 'failed'
+        # Only receipts already marked received have added stock
+        stocked = self.filtered(lambda r: r.receipt_status in ('received', 'quality_check', 'accepted'))
+        self.write({
+            'receipt_status': 'rejected',
+            'quality_check': 'failed',
+        })
 
-            # Reverse stock update
-            acceptable_quantity = receipt.quantity - receipt.damaged_quantity
-            if acceptable_quantity > 0:
-                self.env['construction.warehouse.stock'].update_stock_from_consumption(
-                    receipt.warehouse_id.id,
-                    receipt.material_id.id,
-                    acceptable_quantity
-                )
+        # Reverse stock update
+        self.env['construction.stock.move']._post([{
+            'warehouse_id': receipt.warehouse_id.id,
+            'material_id': receipt.material_id.id,
+            'quantity': -receipt._get_acceptable_quantity(),
+            'move_type': 'receipt_reversal',
+            'receipt_id': receipt.id,
+        } for receipt in stocked])
 
     def action_upload_photos(self):
         """Upload delivery photos"""
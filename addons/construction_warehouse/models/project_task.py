@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields
+
+
+class ProjectTask(models.Model):
+    _inherit = 'project.task'
+
+    material_consumed_cost = fields.Float(
+        string='Material Cost',
+        compute='_compute_material_consumed_cost',
+        groups='construction_warehouse.group_warehouse_user',
+        help='Cost of confirmed and completed material consumptions for this task'
+    )
+
+    def _compute_material_consumed_cost(self):
+        costs = self.env['construction.material.consumption']._get_task_consumed_costs(self.ids)
+        for task in self:
+            task.material_consumed_cost = costs.get(task.id, 0.0)
+
+    def action_view_material_consumptions(self):
+        """View material consumed for this task"""
+        return {
+            'type': 'ir.actions.act_window',
+            'name': f'Materials - {self.name}',
+            'res_model': 'construction.material.consumption',
+            'view_mode': 'tree,form',
+            'domain': [('task_id', '=', self.id)],
+            'context': {
+                'default_task_id': self.id,
+            }
+        }
@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 
+from datetime import datetime, time, timedelta
+
+import pytz
+
 from odoo import models, fields, api
 
 
@@ -37,10 +41,24 @@ class ProjectWarehouse(models.Model):
         string='Storage Capacity (m³)',
         help='Maximum storage capacity in cubic meters'
     )
+    weight_capacity = fields.Float(
+        string='Load Capacity (kg)',
+        help='Maximum weight the warehouse can hold in kilograms'
+    )
+    used_volume = fields.Float(
+        string='Used Volume (m³)',
+        compute='_compute_stock_info',
+        help='Volume occupied by current stock, from material volume per unit'
+    )
+    used_weight = fields.Float(
+        string='Used Load (kg)',
+        compute='_compute_stock_info',
+        help='Weight of current stock, from material weight per unit'
+    )
     current_utilization = fields.Float(
         string='Current Utilization (%)',
-        compute='_compute_utilization',
-        help='Percentage of warehouse capacity currently used'
+        compute='_compute_stock_info',
+        help='Share of volume or load capacity in use, whichever is higher'
     )
 
     active = fields.Boolean(
@@ -74,40 +92,179 @@ class ProjectWarehouse(models.Model):
         help='Total value of materials in warehouse'
     )
 
-    # Recent Activity
+    # Recent Activity (today in the user's timezone, evaluated on read)
     recent_receipts = fields.One2many(
         'construction.material.receipt',
-        'warehouse_id',
         string='Recent Receipts',
-        domain=[('receipt_date', '>=', fields.Date.today())],
+        compute='_compute_recent_activity',
         help='Materials received today'
     )
     recent_consumptions = fields.One2many(
         'construction.material.consumption',
-        'warehouse_id',
         string='Recent Consumptions',
-        domain=[('consumption_date', '>=', fields.Date.today())],
+        compute='_compute_recent_activity',
         help='Materials consumed today'
     )
+    today_receipt_count = fields.Integer(
+        string='Receipts Today',
+        compute='_compute_today_activity'
+    )
+    today_receipt_value = fields.Float(
+        string='Received Value Today',
+        compute='_compute_today_activity'
+    )
+    today_consumption_count = fields.Integer(
+        string='Consumptions Today',
+        compute='_compute_today_activity'
+    )
+    today_consumption_value = fields.Float(
+        string='Consumed Value Today',
+        compute='_compute_today_activity'
+    )
 
-    @api.depends('stock_ids.quantity', 'stock_ids.unit_cost')
-    def _compute_stock_info(self):
+    def _get_datetime_bounds(self, date_from, date_to):
+        """UTC datetime range covering whole days date_from..date_to in the user's timezone"""
+        tz = pytz.timezone(self.env.user.tz or 'UTC')
+        start = tz.localize(datetime.combine(date_from, time.min)).astimezone(pytz.utc)
+        end = tz.localize(datetime.combine(date_to + timedelta(days=1), time.min)).astimezone(pytz.utc)
+        return start.replace(tzinfo=None), end.replace(tzinfo=None)
+
+    def _compute_recent_activity(self):
+        today = fields.Date.context_today(self)
+        start, end = self._get_datetime_bounds(today, today)
+        warehouse_ids = self._origin.ids
+        receipts = self.env['construction.material.receipt'].search([
+            ('warehouse_id', 'in', warehouse_ids),
+            ('receipt_date', '>=', start),
+            ('receipt_date', '<', end),
+        ])
+        consumptions = self.env['construction.material.consumption'].search([
+            ('warehouse_id', 'in', warehouse_ids),
+            ('consumption_date', '>=', start),
+            ('consumption_date', '<', end),
+        ])
+        for warehouse in self:
+            warehouse.recent_receipts = receipts.filtered(lambda r: r.warehouse_id == warehouse._origin)
+            warehouse.recent_consumptions = consumptions.filtered(lambda c: c.warehouse_id == warehouse._origin)
+
+    def _compute_today_activity(self):
+        today = fields.Date.context_today(self)
+        summary = self.get_activity_summary(today, today, by_material=False)
         for warehouse in self:
-            warehouse.stock_count = len(warehouse.stock_ids)
-            warehouse.total_stock_value = sum(
-                stock.quantity * stock.unit_cost
-                for stock in warehouse.stock_ids
+            activity = summary.get(warehouse._origin.id, {})
+            receipts = activity.get('receipts', {})
+            consumptions = activity.get('consumptions', {})
+            warehouse.today_receipt_count = receipts.get('count', 0)
+            warehouse.today_receipt_value = receipts.get('value', 0.0)
+            warehouse.today_consumption_count = consumptions.get('count', 0)
+            warehouse.today_consumption_value = consumptions.get('value', 0.0)
+
+    def get_activity_summary(self, date_from=None, date_to=None, by_material=True):
+        """Receipt and consumption activity per warehouse for a date range.
+
+        Dates default to today. Only receipts that added stock (received,
+        in quality check or accepted) and confirmed or completed
+        consumptions are counted, so drafts such as reorder proposals are
+        left out. Returns, per warehouse id::
+
+            {'receipts': {'count', 'quantity', 'value', 'by_material': [...]},
+             'consumptions': {...}}
+
+        where ``by_material`` lists ``material_id``, ``material_name``,
+        ``count``, ``quantity`` and ``value``. Each side is one grouped
+        query over the (warehouse_id, date) index.
+        """
+        date_from = fields.Date.to_date(date_from) or fields.Date.context_today(self)
+        date_to = fields.Date.to_date(date_to) or date_from
+        start, end = self._get_datetime_bounds(date_from, date_to)
+
+        summary = {
+            warehouse_id: {
+                'receipts': {'count': 0, 'quantity': 0.0, 'value': 0.0, 'by_material': []},
+                'consumptions': {'count': 0, 'quantity': 0.0, 'value': 0.0, 'by_material': []},
+            }
+            for warehouse_id in self._origin.ids
+        }
+        sources = [
+            ('receipts', 'construction.material.receipt', 'receipt_date',
+             ('receipt_status', 'in', ('received', 'quality_check', 'accepted'))),
+            ('consumptions', 'construction.material.consumption', 'consumption_date',
+             ('consumption_status', 'in', ('confirmed', 'completed'))),
+        ]
+        for key, model_name, date_field, status_leaf in sources:
+            groups = self.env[model_name]._read_group(
+                [('warehouse_id', 'in', self._origin.ids),
+                 (date_field, '>=', start),
+                 (date_field, '<', end),
+                 status_leaf],
+                ['warehouse_id', 'material_id'],
+                ['__count', 'quantity:sum', 'total_cost:sum'],
             )
+            for warehouse, material, count, quantity, value in groups:
+                totals = summary[warehouse.id][key]
+                totals['count'] += count
+                totals['quantity'] += quantity
+                totals['value'] += value
+                if by_material:
+                    totals['by_material'].append({
+                        'material_id': material.id,
+                        'material_name': material.name,
+                        'count': count,
+                        'quantity': quantity,
+                        'value': value,
+                    })
+        return summary
 
-    @api.depends('stock_ids', 'storage_capacity')
-    def _compute_utilization(self):
+    @api.depends('stock_ids.quantity', 'stock_ids.unit_cost', 'storage_capacity', 'weight_capacity')
+    def _compute_stock_info(self):
+        totals = self._read_stock_totals()
         for warehouse in self:
+            stock_count, value, volume, weight = totals.get(warehouse._origin.id, (0, 0.0, 0.0, 0.0))
+            warehouse.stock_count = stock_count
+            warehouse.total_stock_value = value
+            warehouse.used_volume = volume
+            warehouse.used_weight = weight
+
+            utilization = []
             if warehouse.storage_capacity > 0:
-                # Simple calculation - would need material volumes for accuracy
-                used_space = len(warehouse.stock_ids) * 10  # Rough estimate
-                warehouse.current_utilization = (used_space / warehouse.storage_capacity) * 100
-            else:
-                warehouse.current_utilization = 0
+                utilization.append(volume / warehouse.storage_capacity * 100)
+            if warehouse.weight_capacity > 0:
+                utilization.append(weight / warehouse.weight_capacity * 100)
+            warehouse.current_utilization = max(utilization) if utilization else 0
+
+    def _read_stock_totals(self):
+        """Line count, value, volume and weight of stock per warehouse in one query.
+
+        Materials without a per-unit volume/weight count by their unit of
+        measure where it is one (m³ for volume, kg/tons for weight).
+        """
+        warehouse_ids = tuple(self._origin.ids)
+        if not warehouse_ids:
+            return {}
+        self.env['construction.warehouse.stock'].flush_model(['warehouse_id', 'material_id', 'quantity', 'unit_cost'])
+        self.env['construction.material'].flush_model(['volume_per_unit', 'weight_per_unit', 'unit_of_measure'])
+        self.env.cr.execute(
+            """
+            SELECT stock.warehouse_id,
+                   COUNT(*),
+                   SUM(stock.quantity * COALESCE(stock.unit_cost, 0)),
+                   SUM(stock.quantity * CASE
+                       WHEN COALESCE(material.volume_per_unit, 0) > 0 THEN material.volume_per_unit
+                       WHEN material.unit_of_measure = 'm3' THEN 1
+                       ELSE 0 END),
+                   SUM(stock.quantity * CASE
+                       WHEN COALESCE(material.weight_per_unit, 0) > 0 THEN material.weight_per_unit
+                       WHEN material.unit_of_measure = 'kg' THEN 1
+                       WHEN material.unit_of_measure = 'tons' THEN 1000
+                       ELSE 0 END)
+              FROM construction_warehouse_stock AS stock
+              JOIN construction_material AS material ON material.id = stock.material_id
+             WHERE stock.warehouse_id IN %s
+             GROUP BY stock.warehouse_id
+            """,
+            [warehouse_ids],
+        )
+        return {row[0]: row[1:] for row in self.env.cr.fetchall()}
 
     def action_view_stock(self):
         """View all stock in this warehouse"""
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+
+from collections import defaultdict
+
+from odoo import models, fields, api, tools
+from odoo.exceptions import UserError
+
+
+class StockMove(models.Model):
+    _name = 'construction.stock.move'
+    _description = 'Stock Move - Append-Only Warehouse Movement Journal'
+    _order = 'date desc, id desc'
+
+    warehouse_id = fields.Many2one(
+        'construction.project.warehouse',
+        string='Warehouse',
+        required=True,
+        index=True,
+        ondelete='cascade',
+        help='Warehouse whose stock changed'
+    )
+    project_id = fields.Many2one(
+        'project.project',
+        string='Project',
+        related='warehouse_id.project_id',
+        store=True,
+        help='Project this movement belongs to'
+    )
+    material_id = fields.Many2one(
+        'construction.material',
+        string='Material',
+        required=True,
+        index=True,
+        help='Material that moved'
+    )
+    date = fields.Datetime(
+        string='Date',
+        required=True,
+        index=True,
+        default=fields.Datetime.now,
+        help='Moment the stock level changed'
+    )
+    quantity = fields.Float(
+        string='Quantity',
+        required=True,
+        help='Signed quantity: positive adds stock, negative removes it'
+    )
+    move_type = fields.Selection([
+        ('receipt', 'Receipt'),
+        ('receipt_reversal', 'Receipt Rejected'),
+        ('consumption', 'Consumption'),
+        ('consumption_cancel', 'Consumption Cancelled'),
+        ('adjustment', 'Adjustment'),
+    ], string='Type', required=True)
+    unit_of_measure = fields.Selection(
+        related='material_id.unit_of_measure',
+        string='Unit'
+    )
+
+    # Origin document
+    receipt_id = fields.Many2one(
+        'construction.material.receipt',
+        string='Receipt',
+        ondelete='set null',
+        help='Receipt that caused this movement'
+    )
+    consumption_id = fields.Many2one(
+        'construction.material.consumption',
+        string='Consumption',
+        ondelete='set null',
+        help='Consumption that caused this movement'
+    )
+    user_id = fields.Many2one(
+        'res.users',
+        string='Done By',
+        default=lambda self: self.env.user,
+        help='User who triggered the movement'
+    )
+
+    def init(self):
+        # Range reads are always per warehouse and date ordered
+        tools.create_index(
+            self._cr, 'construction_stock_move_warehouse_date_index',
+            self._table, ['warehouse_id', 'date'],
+        )
+
+    def write(self, vals):
+        raise UserError("Stock moves are an append-only journal and cannot be modified.")
+
+    def unlink(self):
+        raise UserError("Stock moves are an append-only journal and cannot be deleted.")
+
+    @api.model
+    def _post(self, vals_list):
+        """Apply stock deltas and journal them in the same transaction.
+
+        Each dict needs ``warehouse_id``, ``material_id``, signed ``quantity``
+        and ``move_type``; zero quantities are skipped.
+        """
+        vals_list = [vals for vals in vals_list if vals.get('quantity')]
+        if not vals_list:
+            return self.browse()
+        self.env['construction.warehouse.stock'].apply_stock_moves([
+            (vals['warehouse_id'], vals['material_id'], vals['quantity'])
+            for vals in vals_list
+        ])
+        moves = self.sudo().create(vals_list)
+        moves._log_activity_events()
+        return moves
+
+    # Activity stream titles per movement type
+    _ACTIVITY_TITLES = {
+        'receipt': ('receipt', 'Material received'),
+        'receipt_reversal': ('receipt', 'Material rejected'),
+        'consumption': ('consumption', 'Material consumed'),
+        'consumption_cancel': ('consumption', 'Consumption cancelled'),
+    }
+
+    def _log_activity_events(self):
+        # The activity stream comes with construction_budget, which this
+        # module does not depend on
+        if 'construction.activity.event' not in self.env:
+            return
+        events = []
+        for move in self:
+            if move.move_type not in self._ACTIVITY_TITLES:
+                continue
+            event_type, title = self._ACTIVITY_TITLES[move.move_type]
+            document = move.receipt_id or move.consumption_id
+            events.append({
+                'project_id': move.project_id.id,
+                'date': move.date,
+                'user_id': move.user_id.id,
+                'event_type': event_type,
+                'name': f"{title}: {move.material_id.name}",
+                'description': f"{abs(move.quantity)} {move.unit_of_measure or ''}".strip(),
+                'res_model': document._name if document else False,
+                'res_id': document.id,
+            })
+        self.env['construction.activity.event']._log(events)
+
+    @api.model
+    def get_stock_at(self, warehouse_ids, at_date):
+        """Stock per (warehouse, material) at ``at_date``.
+
+        Starts from each warehouse's latest snapshot taken at or before
+        ``at_date`` and replays only the journal entries it does not
+        include, i.e. those after its journal watermark.
+        Returns ``{(warehouse_id, material_id): quantity}``. Stock held
+        before the journal existed is only known from the first snapshot on.
+        """
+        if not warehouse_ids:
+            return {}
+        at_date = fields.Datetime.to_datetime(at_date)
+        bases = self.env['construction.stock.snapshot']._get_bases(warehouse_ids, at_date)
+
+        stock = defaultdict(float)
+        for (warehouse_id, material_id), quantity in bases['quantities'].items():
+            stock[(warehouse_id, material_id)] += quantity
+
+        self.flush_model(['warehouse_id', 'material_id', 'date', 'quantity'])
+        self.env.cr.execute(
+            """
+            SELECT move.warehouse_id, move.material_id, SUM(move.quantity)
+              FROM construction_stock_move AS move
+              JOIN (VALUES {}) AS base(warehouse_id, since, watermark)
+                ON base.warehouse_id = move.warehouse_id
+             WHERE (base.since IS NULL OR CASE
+                        WHEN base.watermark IS NULL THEN move.date > base.since
+                        ELSE move.id > base.watermark
+                    END)
+               AND move.date <= %s
+             GROUP BY move.warehouse_id, move.material_id
+            """.format(', '.join(['(%s, %s::timestamp, %s::integer)'] * len(warehouse_ids))),
+            [value for warehouse_id in warehouse_ids
+             for value in (warehouse_id, bases['dates'].get(warehouse_id),
+                           bases['watermarks'].get(warehouse_id))] + [at_date],
+        )
+        for warehouse_id, material_id, quantity in self.env.cr.fetchall():
+            stock[(warehouse_id, material_id)] += quantity
+
+        return {key: quantity for key, quantity in stock.items() if quantity}
+
+    @api.model
+    def get_movements(self, warehouse_ids, date_from, date_to, material_ids=None):
+        """Journal entries of the given warehouses within [date_from, date_to]"""
+        domain = [
+            ('warehouse_id', 'in', warehouse_ids),
+            ('date', '>=', date_from),
+            ('date', '<=', date_to),
+        ]
+        if material_ids:
+            domain.append(('material_id', 'in', material_ids))
+        return self.search_read(domain, [
+            'date', 'warehouse_id', 'material_id', 'quantity', 'move_type',
+            'receipt_id', 'consumption_id', 'user_id',
+        ], order='date, id')
+
+
+class StockSnapshot(models.Model):
+    _name = 'construction.stock.snapshot'
+    _description = 'Stock Snapshot - Periodic Per-Warehouse Stock Levels'
+    _order = 'snapshot_date desc, warehouse_id, material_id'
+
+    warehouse_id = fields.Many2one(
+        'construction.project.warehouse',
+        string='Warehouse',
+        required=True,
+        ondelete='cascade',
+        help='Warehouse this snapshot line belongs to'
+    )
+    material_id = fields.Many2one(
+        'construction.material',
+        string='Material',
+        required=True,
+        help='Material counted'
+    )
+    snapshot_date = fields.Datetime(
+        string='Snapshot Date',
+        required=True,
+        help='Moment the stock levels were captured'
+    )
+    quantity = fields.Float(
+        string='Quantity',
+        help='Stock level at the snapshot date'
+    )
+    move_watermark = fields.Integer(
+        string='Journal Watermark',
+        help='Last journal entry of the warehouse included in this snapshot'
+    )
+
+    def init(self):
+        tools.create_index(
+            self._cr, 'construction_stock_snapshot_warehouse_date_index',
+            self._table, ['warehouse_id', 'snapshot_date'],
+        )
+
+    @api.model
+    def _get_bases(self, warehouse_ids, at_date):
+        """Latest snapshot per warehouse at or before ``at_date``.
+
+        Returns its ``dates``, journal ``watermarks`` and ``quantities``;
+        snapshots taken before watermarks existed have none and are
+        replayed by date instead.
+        """
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            SELECT warehouse_id, MAX(snapshot_date)
+              FROM construction_stock_snapshot
+             WHERE warehouse_id IN %s AND snapshot_date <= %s
+             GROUP BY warehouse_id
+            """,
+            [tuple(warehouse_ids), at_date],
+        )
+        dates = dict(self.env.cr.fetchall())
+
+        quantities = {}
+        watermarks = {}
+        if dates:
+            self.env.cr.execute(
+                """
+                SELECT warehouse_id, material_id, quantity, move_watermark
+                  FROM construction_stock_snapshot
+                 WHERE (warehouse_id, snapshot_date) IN %s
+                """,
+                [tuple(dates.items())],
+            )
+            for warehouse_id, material_id, quantity, watermark in self.env.cr.fetchall():
+                quantities[(warehouse_id, material_id)] = quantity
+                if watermark is not None:
+                    watermarks[warehouse_id] = watermark
+        return {'dates': dates, 'watermarks': watermarks, 'quantities': quantities}
+
+    @api.model
+    def create_snapshots(self, warehouse_ids=None):
+        """Capture current stock levels of the given (default: all active) warehouses"""
+        if warehouse_ids is None:
+            warehouse_ids = self.env['construction.project.warehouse'].search([]).ids
+        if not warehouse_ids:
+            return self.browse()
+
+        # Writers lock stock rows FOR UPDATE before journaling, so sharing
+        # those locks waits for in-flight movements, and one committed since
+        # this transaction began fails it with a serialization error instead
+        # of being missed. The stock table then matches the journal up to
+        # each warehouse's last visible entry, which is stored as watermark
+        # because dates only have one second resolution.
+        Stock = self.env['construction.warehouse.stock']
+        Stock.flush_model()
+        self.env['construction.stock.move'].flush_model()
+        self.env.cr.execute(
+            """
+            SELECT id FROM construction_warehouse_stock
+             WHERE warehouse_id IN %s
+             ORDER BY id
+               FOR SHARE
+            """,
+            [tuple(warehouse_ids)],
+        )
+        self.env.cr.execute(
+            """
+            SELECT warehouse_id, MAX(id)
+              FROM construction_stock_move
+             WHERE warehouse_id IN %s
+             GROUP BY warehouse_id
+            """,
+            [tuple(warehouse_ids)],
+        )
+        watermarks = dict(self.env.cr.fetchall())
+
+        now = fields.Datetime.now()
+        groups = Stock._read_group(
+            [('warehouse_id', 'in', warehouse_ids), ('quantity', '!=', 0)],
+            ['warehouse_id', 'material_id'],
+            ['quantity:sum'],
+        )
+        return self.create([{
+            'warehouse_id': warehouse.id,
+            'material_id': material.id,
+            'snapshot_date': now,
+            'quantity': quantity,
+            'move_watermark': watermarks.get(warehouse.id, 0),
+        } for warehouse, material, quantity in groups])
+
+    @api.model
+    def _cron_create_snapshots(self):
+        self.create_snapshots()
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
+from collections import defaultdict
+
 from odoo import models, fields, api
+from odoo.exceptions import ValidationError
 
 
 class WarehouseStock(models.Model):
@@ -8,6 +11,17 @@ class WarehouseStock(models.Model):
     _description = 'Warehouse Stock - Current Inventory Levels'
     _order = 'warehouse_id, material_id'
     _rec_name = 'display_name'
+    # Reorder engine parameters (days)
+    _REORDER_LOOKBACK_DAYS = 30
+    _REORDER_LEAD_TIME_DAYS = 7
+    _REORDER_SAFETY_DAYS = 3
+    _REORDER_TARGET_COVER_DAYS = 21
+    _EXCESS_COVER_DAYS = 90
+
+    _sql_constraints = [
+        ('warehouse_material_uniq', 'unique(warehouse_id, material_id)',
+         'A material can only have one stock line per warehouse.'),
+    ]
 
     # Basic Information
     warehouse_id = fields.Many2one(
@@ -90,6 +104,24 @@ class WarehouseStock(models.Model):
         ('excess', 'Excess Stock'),
     ], string='Stock Status', compute='_compute_stock_status', store=True)
 
+    # Reorder Engine (refreshed by the scheduled reorder run)
+    daily_consumption = fields.Float(
+        string='Daily Consumption',
+        readonly=True,
+        help='Average quantity consumed per day over the recent consumption history'
+    )
+    reorder_point = fields.Float(
+        string='Reorder Point',
+        readonly=True,
+        help='Dynamic minimum: consumption over supplier lead time plus safety days'
+    )
+    days_of_cover = fields.Float(
+        string='Days of Cover',
+        compute='_compute_days_of_cover',
+        store=True,
+        help='Days current stock lasts at the current consumption rate (0 if not consumed)'
+    )
+
     # Storage Information
     storage_location = fields.Char(
         string='Storage Location',
@@ -155,46 +187,78 @@ class WarehouseStock(models.Model):
         for stock in self:
             stock.total_value = stock.quantity * stock.unit_cost
 
-    @api.depends('quantity', 'minimum_quantity', 'available_quantity')
+    @api.depends('quantity', 'daily_consumption')
+    def _compute_days_of_cover(self):
+        for stock in self:
+            if stock.daily_consumption > 0:
+                stock.days_of_cover = stock.quantity / stock.daily_consumption
+            else:
+                stock.days_of_cover = 0
+
+    @api.depends('quantity', 'minimum_quantity', 'available_quantity', 'reorder_point', 'daily_consumption', 'days_of_cover')
     def _compute_stock_status(self):
         for stock in self:
             if stock.quantity <= 0:
                 stock.stock_status = 'out'
-            elif stock.quantity <= stock.minimum_quantity:
+            elif stock.quantity <= max(stock.minimum_quantity, stock.reorder_point):
                 stock.stock_status = 'low'
-            elif stock.quantity > stock.minimum_quantity * 3:  # Arbitrary excess threshold
+            elif stock.daily_consumption > 0 and stock.days_of_cover > self._EXCESS_COVER_DAYS:
+                stock.stock_status = 'excess'
+            elif not stock.daily_consumption and 0 < stock.minimum_quantity * 3 < stock.quantity:
+                # No consumption history yet: fall back to the static threshold
                 stock.stock_status = 'excess'
             else:
                 stock.stock_status = 'ok'
 
+    def _get_activity_domain(self):
+        """Domain matching receipts/consumptions of every (warehouse, material) pair in self"""
+        return [
+            ('warehouse_id', 'in', self.warehouse_id.ids),
+            ('material_id', 'in', self.material_id.ids),
+        ]
+
+    def _read_last_dates(self, model_name, date_field):
+        """Max date per (warehouse, material) pair with one grouped query"""
+        if not self.warehouse_id or not self.material_id:
+            return {}
+        groups = self.env[model_name]._read_group(
+            self._get_activity_domain(),
+            ['warehouse_id', 'material_id'],
+            [f'{date_field}:max'],
+        )
+        return {
+            (warehouse.id, material.id): last_date
+            for warehouse, material, last_date in groups
+        }
+
     @api.depends('warehouse_id', 'material_id')
     def _compute_last_activity(self):
+        last_receipts = self._read_last_dates('construction.material.receipt', 'receipt_date')
+        last_consumptions = self._read_last_dates('construction.material.consumption', 'consumption_date')
         for stock in self:
-            # Last receipt
-            last_receipt = self.env['construction.material.receipt'].search([
-                ('warehouse_id', '=', stock.warehouse_id.id),
-                ('material_id', '=', stock.material_id.id)
-            ], order='receipt_date desc', limit=1)
-            stock.last_receipt_date = last_receipt.receipt_date if last_receipt else False
-
-            # Last consumption
-            last_consumption = self.env['construction.material.consumption'].search([
-                ('warehouse_id', '=', stock.warehouse_id.id),
-                ('material_id', '=', stock.material_id.id)
-            ], order='consumption_date desc', limit=1)
-            stock.last_consumption_date = last_consumption.consumption_date if last_consumption else False
+            key = (stock.warehouse_id.id, stock.material_id.id)
+            stock.last_receipt_date = last_receipts.get(key, False)
+            stock.last_consumption_date = last_consumptions.get(key, False)
 
     @api.depends('warehouse_id', 'material_id')
     def _compute_related_records(self):
+        # Non-stored and only shown on the form, so this runs when the form
+        # reads the movement tabs - one search per model for the whole batch
+        receipts_by_key = defaultdict(list)
+        consumptions_by_key = defaultdict(list)
+        if self.warehouse_id and self.material_id:
+            domain = self._get_activity_domain()
+            for receipt in self.env['construction.material.receipt'].search(domain):
+                receipts_by_key[(receipt.warehouse_id.id, receipt.material_id.id)].append(receipt.id)
+            for consumption in self.env['construction.material.consumption'].search(domain):
+                consumptions_by_key[(consumption.warehouse_id.id, consumption.material_id.id)].append(consumption.id)
+
+        Receipt = self.env['construction.material.receipt']
+        Consumption = self.env['construction.material.consumption']
         for stock in self:
-            stock.receipt_ids = self.env['construction.material.receipt'].search([
-                ('warehouse_id', '=', stock.warehouse_id.id),
-                ('material_id', '=', stock.material_id.id)
-            ])
-            stock.consumption_ids = self.env['construction.material.consumption'].search([
-                ('warehouse_id', '=', stock.warehouse_id.id),
-                ('material_id', '=', stock.material_id.id)
-            ])
+            key = (stock.warehouse_id.id, stock.material_id.id)
+            stock.receipt_ids = Receipt.browse(receipts_by_key[key])
+            stock.consumption_ids = Consumption.browse(consumptions_by_key[key])
 
     @api.depends('warehouse_id', 'material_id', 'quantity')
     def _compute_display_name(self):
@@ -249,32 +313,210 @@ class WarehouseStock(models.Model):
         return receipt_action
 
     @api.model
-    def update_stock_from_receipt(self, warehouse_id, material_id, quantity):
-        """Update stock levels when material is received"""
-        stock = self.search([
-            ('warehouse_id', '=', warehouse_id),
-            ('material_id', '=', material_id)
-        ], limit=1)
-
-        if stock:
-            stock.quantity += quantity
-        else:
-            # Create new stock record
-            self.create({
-                'warehouse_id': warehouse_id,
-                'material_id': material_id,
+    def apply_stock_moves(self, moves):
+        """Atomically apply stock deltas for many (warehouse, material) pairs.
+
+        ``moves`` is an iterable of ``(warehouse_id, material_id, delta)``;
+        positive deltas add stock, negative deltas remove it. Deltas are
+        summed per pair, the affected stock rows are locked with
+        ``SELECT ... FOR UPDATE`` in id order and updated with a single
+        statement, so concurrent confirmations serialize on the rows they
+        touch and cannot drive stock below the reserved quantity.
+        """
+        deltas = defaultdict(float)
+        for warehouse_id, material_id, delta in moves:
+            if delta:
+                deltas[(warehouse_id, material_id)] += delta
+        if not deltas:
+            return self.browse()
+
+        # Pending ORM writes must reach the database before we lock and read
+        self.flush_model(['warehouse_id', 'material_id', 'quantity', 'reserved_quantity'])
+        locked = self._lock_stock_rows(list(deltas))
+
+        shortages = [
+            key for key in deltas
+            if deltas[key] < 0 and (key not in locked or locked[key][1] + deltas[key] < 0)
+        ]
+        if shortages:
+            self._raise_insufficient_stock(shortages, deltas, locked)
+
+        # Pairs receiving stock for the first time get a fresh row
+        missing = [key for key in deltas if key not in locked]
+        created = self.create([{
+            'warehouse_id': warehouse_id,
+            'material_id': material_id,
+            'quantity': deltas[(warehouse_id, material_id)],
+        } for warehouse_id, material_id in missing])
+
+        if locked:
+            values = [(stock_id, deltas[key]) for key, (stock_id, available) in locked.items()]
+            self.env.cr.execute(
+                """
+                UPDATE construction_warehouse_stock AS stock
+                   SET quantity = stock.quantity + delta.quantity,
+                       write_uid = %s,
+                       write_date = (now() at time zone 'UTC')
+                  FROM (VALUES {}) AS delta(id, quantity)
+                 WHERE stock.id = delta.id
+                """.format(', '.join(['(%s, %s)'] * len(values))),
+                [self.env.uid] + [value for row in values for value in row],
+            )
+        updated = self.browse([stock_id for stock_id, available in locked.values()])
+        if updated:
+            updated.invalidate_recordset(['quantity', 'write_uid', 'write_date'])
+            # Recompute available quantity, value and status for the new levels
+            updated.modified(['quantity'])
+            updated.flush_recordset()
+
+        return updated | created
+
+    def _lock_stock_rows(self, keys):
+        """Lock stock rows for (warehouse, material) keys, return {key: (id, available)}"""
+        self.env.cr.execute(
+            """
+            SELECT id, warehouse_id, material_id, quantity - COALESCE(reserved_quantity, 0)
+              FROM construction_warehouse_stock
+             WHERE (warehouse_id, material_id) IN %s
+             ORDER BY id
+               FOR UPDATE
+            """,
+            [tuple(keys)],
+        )
+        locked = {}
+        for stock_id, warehouse_id, material_id, available in self.env.cr.fetchall():
+            # Duplicate rows from before the unique constraint: keep the first one
+            locked.setdefault((warehouse_id, material_id), (stock_id, available or 0.0))
+        return locked
+
+    def _raise_insufficient_stock(self, keys, deltas, locked):
+        warehouses = self.env['construction.project.warehouse'].browse({key[0] for key in keys})
+        materials = self.env['construction.material'].browse({key[1] for key in keys})
+        warehouse_names = dict(zip(warehouses.ids, warehouses.mapped('name')))
+        material_names = dict(zip(materials.ids, materials.mapped('name')))
+        lines = []
+        for key in keys:
+            available = locked[key][1] if key in locked else 0.0
+            lines.append(
+                f"{material_names.get(key[1])} in {warehouse_names.get(key[0])}: "
+                f"requested {-deltas[key]}, only {available} units available"
+            )
+        raise ValidationError("Insufficient stock:\n" + "\n".join(lines))
+
+    @api.model
+    def compute_reorder_points(self):
+        """Refresh consumption velocity and reorder points of all stock lines.
+
+        Velocity is the confirmed consumption per (warehouse, material) over
+        the lookback window, aggregated and written back in one statement.
+        Days of cover and stock status are then recomputed in one batch.
+        """
+        self.flush_model()
+        self.env['construction.material.consumption'].flush_model([
+            'warehouse_id', 'material_id', 'quantity', 'consumption_status', 'consumption_date',
+        ])
+        since = fields.Datetime.subtract(fields.Datetime.now(), days=self._REORDER_LOOKBACK_DAYS)
+        self.env.cr.execute(
+            """
+            WITH usage AS (
+                SELECT warehouse_id, material_id, SUM(quantity) / %(lookback)s AS velocity
+                  FROM construction_material_consumption
+                 WHERE consumption_status IN ('confirmed', 'completed')
+                   AND consumption_date >= %(since)s
+                 GROUP BY warehouse_id, material_id
+            )
+            UPDATE construction_warehouse_stock AS stock
+               SET daily_consumption = COALESCE(usage.velocity, 0),
+                   reorder_point = COALESCE(usage.velocity, 0) * %(cover)s
+              FROM construction_warehouse_stock AS line
+              LEFT JOIN usage
+                ON usage.warehouse_id = line.warehouse_id
+               AND usage.material_id = line.material_id
+             WHERE stock.id = line.id
+               AND (stock.daily_consumption IS DISTINCT FROM COALESCE(usage.velocity, 0)
+                    OR stock.reorder_point IS DISTINCT FROM COALESCE(usage.velocity, 0) * %(cover)s)
+            RETURNING stock.id
+            """,
+            {
+                'lookback': self._REORDER_LOOKBACK_DAYS,
+                'since': since,
+                'cover': self._REORDER_LEAD_TIME_DAYS + self._REORDER_SAFETY_DAYS,
+            },
+        )
+        changed = self.browse([row[0] for row in self.env.cr.fetchall()])
+        changed.invalidate_recordset(['daily_consumption', 'reorder_point'])
+        changed.modified(['daily_consumption', 'reorder_point'])
+        changed.flush_recordset()
+        return changed
+
+    @api.model
+    def generate_reorder_receipts(self):
+        """Create draft receipts for stock lines at or below their reorder level.
+
+        Materials without a preferred supplier are left out, as are lines
+        that already have a draft receipt waiting. Returns the new receipts.
+        """
+        Receipt = self.env['construction.material.receipt']
+        stocks = self.search([
+            ('stock_status', 'in', ['low', 'out']),
+            ('material_id.preferred_supplier_id', '!=', False),
+        ])
+        if not stocks:
+            return Receipt
+
+        pending = {
+            (warehouse.id, material.id)
+            for warehouse, material in Receipt._read_group(
+                [('receipt_status', '=', 'draft'),
+                 ('warehouse_id', 'in', stocks.warehouse_id.ids),
+                 ('material_id', 'in', stocks.material_id.ids)],
+                ['warehouse_id', 'material_id'],
+            )
+        }
+
+        vals_list = []
+        for stock in stocks:
+            if (stock.warehouse_id.id, stock.material_id.id) in pending:
+                continue
+            target = max(
+                stock.reorder_point + stock.daily_consumption * self._REORDER_TARGET_COVER_DAYS,
+                stock.minimum_quantity * 2,
+            )
+            quantity = target - stock.quantity
+            if quantity <= 0:
+                continue
+            vals_list.append({
+                'warehouse_id': stock.warehouse_id.id,
+                'material_id': stock.material_id.id,
+                'supplier_id': stock.material_id.preferred_supplier_id.id,
                 'quantity': quantity,
+                'unit_cost': stock.material_id.standard_cost or stock.unit_cost,
+                'receipt_status': 'draft',
+                'receipt_notes': 'Reorder suggestion generated from consumption rate',
             })
+        return Receipt.create(vals_list)
+
+    @api.model
+    def _cron_reorder_engine(self):
+        self.compute_reorder_points()
+        self.generate_reorder_receipts()
+
+    @api.model
+    def update_stock_from_receipt(self, warehouse_id, material_id, quantity):
+        """Update stock levels when material is received"""
+        self.env['construction.stock.move']._post([{
+            'warehouse_id': warehouse_id,
+            'material_id': material_id,
+            'quantity': quantity,
+            'move_type': 'adjustment',
+        }])
 
     @api.model
     def update_stock_from_consumption(self, warehouse_id, material_id, quantity):
         """Update stock levels when material is consumed"""
-        stock = self.search([
-            ('warehouse_id', '=', warehouse_id),
-            ('material_id', '=', material_id)
-        ], limit=1)
-
-        if stock:
-            stock.quantity -= quantity
-            if stock.quantity < 0:
-                stock.quantity = 0  # Prevent negative stock
\ No newline at end of file
+        self.env['construction.stock.move']._post([{
+            'warehouse_id': warehouse_id,
+            'material_id': material_id,
+            'quantity': -quantity,
+            'move_type': 'adjustment',
+        }])